@@ -7,13 +7,50 @@ into a structured format with person-centric data organization including
 demographics, diseases, procedures, and family relationships.
 """
 
+import csv
+import gzip
+import hashlib
+import io
+import itertools
 import json
+import math
 import re
 import sys
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+# Raw columns read by each sub-record extractor. The raw export is a flattened
+# join, so the same slice of these columns repeats across many rows for a
+# subject; process_records() only runs an extractor on slices it has not seen.
+# Keep these in step with the _extract_* methods below.
+PARTNER_COLUMNS = (
+    'CORE[Value]',
+    'CORE[SPOUSE Num]'
+)
+CANCER_COLUMNS = (
+    'Subject_cancer[CANCER.ICD03]',
+    'Subject_cancer[CANCER.NUM]',
+    'Subject_cancer[CANCER.PRM_TUMOR_LATERAL_TP_STD]',
+    'Subject_cancer[CANCER.PATH_ACQ_METH_TP]',
+    'Subject_cancer[CANCER.AGE_AT_DIAGNOSIS]',
+    'Subject_cancer[CANCER.DX_DT]'
+)
+NON_CANCER_COLUMNS = (
+    'Subject non cancer[N_CANCER.CD10_CD]',
+    'Subject non cancer[N_CANCER.NUMBER]',
+    'Subject non cancer[N_CANCER.PRM_TUMOR_LATERAL_TP_STD]',
+    'Subject non cancer[N_CANCER.TBD]',
+    'Subject non cancer[N_CANCER.AGE_AT_DIAGNOSIS]',
+    'Subject non cancer[N_CANCER.BX_DT]'
+)
+PROCEDURE_COLUMNS = (
+    'Subject procedure[PRTRT.ICD_9_STD]',
+    'Subject procedure[PRTRT.NUMBER]',
+    'Subject procedure[PRTRT.DERIV_PRSN_AGE]',
+    'Subject procedure[PRTRT.PRSTDAT]'
+)
 
 class JSONProcessor:
     """
@@ -28,6 +65,14 @@ class JSONProcessor:
         #self.proband = None
         self.general = defaultdict(dict)
         self.people = defaultdict(dict)
+        self.record_count = 0
+        self.summary = {
+            'people': 0,
+            'generations': 0,
+            'cancers': 0,
+            'earliest_cancer_age_of_diagnosis': None,
+            'deceased': 0
+        }
 
     def load_s3_json(self, s3_obj) -> Optional[Dict[str, Any]]:
         """
@@ -81,8 +126,9 @@ class JSONProcessor:
         if not file_path.is_file():
             raise ValueError(f"Path is not a file: {file_path}")
 
+        opener = gzip.open if file_path.suffix.lower() == '.gz' else open
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with opener(file_path, 'rt', encoding='utf-8') as f:
                 data = json.load(f)
                 print(f"[INFO] Successfully loaded JSON from: {file_path}")
                 return data
@@ -96,6 +142,79 @@ class JSONProcessor:
             print(f"[ERROR] Unexpected error loading {file_path}: {e}")
             raise
 
+    def read_delimited(self, stream: Iterable[str], delimiter: str = ',') -> Iterator[Dict[str, Any]]:
+        """
+        Stream records from CSV/TSV text with the same flat columns as the JSON export.
+
+        Args:
+            stream: Text stream (or other iterable of lines) starting with the header row
+            delimiter: Field delimiter (',' for CSV, '\\t' for TSV)
+
+        Yields:
+            One record dictionary per row
+        """
+        reader = csv.DictReader(stream, delimiter=delimiter, restval='')
+        if not reader.fieldnames:
+            raise ValueError("Delimited input has no header row")
+        yield from reader
+
+    def load_delimited(self, file_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream records from a .csv/.tsv file, optionally gzipped (.csv.gz/.tsv.gz).
+
+        Args:
+            file_path: Path to the delimited file
+
+        Yields:
+            One record dictionary per row
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file is not a supported delimited format
+        """
+        file_path = Path(file_path)
+
+        if not file_path.is_file():
+            raise FileNotFoundError(f"Delimited file not found: {file_path}")
+
+        input_format, compressed = detect_format(file_path.name)
+        if input_format not in DELIMITERS:
+            raise ValueError(f"Not a CSV/TSV file: {file_path}")
+
+        # utf-8-sig drops the byte order mark spreadsheet exports often start with
+        opener = gzip.open if compressed else open
+        with opener(file_path, 'rt', encoding='utf-8-sig', newline='') as f:
+            print(f"[INFO] Streaming {input_format.upper()} records from: {file_path}")
+            yield from self.read_delimited(f, DELIMITERS[input_format])
+
+    def load_s3_records(self, body: BinaryIO, key: str) -> Iterable[Dict[str, Any]]:
+        """
+        Load records from an S3 object body, choosing the format from the key suffix.
+
+        JSON is parsed in full; CSV/TSV are decoded and streamed row by row.
+
+        Args:
+            body: Binary stream of the object content (e.g. get_object()['Body'])
+            key: Object key, used to detect the format and compression
+
+        Returns:
+            List or iterator of record dictionaries
+        """
+        input_format, compressed = detect_format(key)
+        if compressed:
+            body = gzip.GzipFile(fileobj=body)
+
+        if input_format == 'json':
+            input_data = self.load_s3_json(body.read().decode('utf-8-sig'))
+            if not isinstance(input_data, list):
+                raise ValueError("Input JSON must be a list of records")
+            return input_data
+
+        # Like open(..., newline=''), only \r and \n end rows (a codecs reader also splits
+        # on U+2028 and friends), and utf-8-sig drops a leading byte order mark
+        text = io.TextIOWrapper(body, encoding='utf-8-sig', newline='')
+        return self.read_delimited(text, DELIMITERS[input_format])
+
     def save_json(self, data: Dict[str, Any], output_path: Union[str, Path], indent: int = 2) -> None:
         """
         Save data to JSON file with pretty formatting.
@@ -227,7 +346,7 @@ class JSONProcessor:
         }
 
     def _add_unique_item(self, items_list: List[Dict], new_item: Dict,
-                         unique_key: str) -> None:
+                         unique_key: str) -> bool:
         """
         Add item to list if it doesn't already exist based on unique key.
 
@@ -235,10 +354,83 @@ class JSONProcessor:
             items_list: List to add item to
             new_item: Item to potentially add
             unique_key: Key to check for uniqueness
+
+        Returns:
+            True if the item was added, False if it was already present
         """
         if not any(item.get(unique_key) == new_item.get(unique_key)
                    for item in items_list):
             items_list.append(new_item)
+            return True
+        return False
+
+    def _is_new_slice(self, seen: Set[Tuple], person_id: str, slice_name: str,
+                      columns: Tuple[str, ...], record: Dict[str, Any]) -> bool:
+        """
+        Fingerprint a subject's slice of columns and report whether it is new.
+
+        Args:
+            seen: Fingerprints already handled in this run (updated in place)
+            person_id: Subject the record belongs to
+            slice_name: Name of the sub-record (partner, cancer, ...)
+            columns: Raw columns making up the slice
+            record: Raw medical record dictionary
+
+        Returns:
+            True the first time a subject's slice values are seen, False afterwards
+        """
+        fingerprint = (person_id, slice_name, tuple(record.get(c, '') for c in columns))
+        if fingerprint in seen:
+            return False
+        seen.add(fingerprint)
+        return True
+
+    def _tally_cancer(self, disease: Dict[str, Any]) -> None:
+        """Update the family summary with a newly added cancer."""
+        self.summary['cancers'] += 1
+
+        try:
+            age = float(disease.get('age_of_diagnosis', ''))
+        except (TypeError, ValueError):
+            return
+        # 'nan' and 'inf' parse as floats but cannot be written as JSON
+        if not math.isfinite(age):
+            return
+        if age.is_integer():
+            age = int(age)
+        earliest = self.summary['earliest_cancer_age_of_diagnosis']
+        if earliest is None or age < earliest:
+            self.summary['earliest_cancer_age_of_diagnosis'] = age
+
+    def _count_generations(self) -> int:
+        """
+        Count the generations in the family as the longest parent chain.
+
+        Parents that are not in the family are ignored, and each person is
+        visited once, so a malformed (cyclic) pedigree cannot loop forever.
+        """
+        depth = {}
+        for start in self.people:
+            stack = [start]
+            visiting = set()
+            while stack:
+                person_id = stack[-1]
+                if person_id in depth:
+                    stack.pop()
+                    continue
+                visiting.add(person_id)
+                parents = [self.people[person_id].get(k) for k in ('father', 'mother')]
+                parents = [p for p in parents if p in self.people and p not in depth]
+                pending = [p for p in parents if p not in visiting]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                parent_depths = [depth.get(self.people[person_id].get(k), 0) for k in ('father', 'mother')]
+                depth[person_id] = 1 + max(parent_depths)
+                visiting.discard(person_id)
+                stack.pop()
+
+        return max(depth.values(), default=0)
 
     def _parse_medical_code(self, text):
         """
@@ -267,58 +459,73 @@ class JSONProcessor:
         else:
             return None, None
 
-    def process_records(self, records: List[Dict[str, Any]]) -> None:
+    def process_records(self, records: Iterable[Dict[str, Any]]) -> None:
         """
-        Process a list of medical records and organize by person.
+        Process medical records and organize by person.
+
+        Records are consumed in a single pass, so a stream (e.g. from
+        read_delimited()) works as well as a list.
 
         Args:
-            records: List of medical record dictionaries
+            records: List or iterator of medical record dictionaries
 
         Raises:
             ValueError: If records are invalid or missing required fields
         """
-        if not records:
+        records = iter(records)
+        first_record = next(records, None)
+        if not first_record:
             raise ValueError("No records provided for processing")
 
         # Set study, proband, family classification, and family genetic status as the first person in the input file
         try:
-            self.general["study"] = records[0]['Merge1[project]']
+            self.general["study"] = first_record['Merge1[project]']
             print(f"[INFO] Processing study: {self.general['study']}")
         except (KeyError, IndexError):
             raise ValueError("Cannot determine proband from first record")
         try:
-            self.general["proband"] = records[0]['Merge1[Subject]']
-            #self.proband = self.general["proband"] #records[0]['Merge1[Subject]']
+            self.general["proband"] = first_record['Merge1[Subject]']
+            #self.proband = self.general["proband"] #first_record['Merge1[Subject]']
             print(f"[INFO] Processing proband: {self.general['proband']}")
         except (KeyError, IndexError):
             raise ValueError("Cannot determine proband from first record")
         try:
-            self.general["family_classification"] = records[0]['Append Genetic status[result.family_classification]']
+            self.general["family_classification"] = first_record['Append Genetic status[result.family_classification]']
             print(f"[INFO] Processing family classification: {self.general['family_classification']}")
         except (KeyError, IndexError):
             self.general["family_classification"] = "NO-FAMILY-CLASSIFICATION"
             print(f"[WARNING] Cannot determine family classification from first record")
             #raise ValueError("Cannot determine family classification from first record")
         try:
-            self.general["family_genetic_status"] = records[0]['Append Genetic status[result.family_genetic_status]']
+            self.general["family_genetic_status"] = first_record['Append Genetic status[result.family_genetic_status]']
             print(f"[INFO] Processing family genetic status: {self.general['family_genetic_status']}")
         except (KeyError, IndexError):
             self.general["family_genetic_status"] = "NO-FAMILY-GENETIC-STATUS"
             print(f"[WARNING] Cannot determine family genetic status from first record")
             #raise ValueError("Cannot determine family genetic status from first record")
 
-        # Process each record
-        for i, record in enumerate(records):
+        # Process each record, extracting only person data and sub-record slices
+        # that have not already been seen for the subject
+        seen = set()
+        self.record_count = 0
+        for i, record in enumerate(itertools.chain([first_record], records)):
+            self.record_count += 1
             try:
-                person_id, person_data = self.extract_person_data(record)
+                person_id = record.get('Merge1[Subject]', '')
 
                 # Initialize person if not exists
                 if person_id not in self.people:
+                    person_id, person_data = self.extract_person_data(record)
                     self.people[person_id] = person_data
+                    self.summary['people'] += 1
+                    if person_data['deceased']:
+                        self.summary['deceased'] += 1
 
                 # Add partner information
-                partner_data = self._extract_partner_data(record)
-                if partner_data.get('spouse_num'):
+                partner_data = None
+                if self._is_new_slice(seen, person_id, 'partner', PARTNER_COLUMNS, record):
+                    partner_data = self._extract_partner_data(record)
+                if partner_data and partner_data.get('spouse_num'):
                     self._add_unique_item(
                         self.people[person_id]['partners'],
                         partner_data,
@@ -326,16 +533,21 @@ class JSONProcessor:
                     )
 
                 # Add cancer disease if present
-                cancer_disease = self._extract_cancer_disease(record)
+                cancer_disease = None
+                if self._is_new_slice(seen, person_id, 'cancer', CANCER_COLUMNS, record):
+                    cancer_disease = self._extract_cancer_disease(record)
                 if cancer_disease and cancer_disease.get('d_num'):
-                    self._add_unique_item(
+                    if self._add_unique_item(
                         self.people[person_id]['diseases'],
                         cancer_disease,
                         'd_num'
-                    )
+                    ):
+                        self._tally_cancer(cancer_disease)
 
                 # Add non-cancer disease if present
-                non_cancer_disease = self._extract_non_cancer_disease(record)
+                non_cancer_disease = None
+                if self._is_new_slice(seen, person_id, 'non_cancer', NON_CANCER_COLUMNS, record):
+                    non_cancer_disease = self._extract_non_cancer_disease(record)
                 if non_cancer_disease and non_cancer_disease.get('d_num'):
                     self._add_unique_item(
                         self.people[person_id]['diseases'],
@@ -344,7 +556,9 @@ class JSONProcessor:
                     )
 
                 # Add procedure if present
-                procedure = self._extract_procedure(record)
+                procedure = None
+                if self._is_new_slice(seen, person_id, 'procedure', PROCEDURE_COLUMNS, record):
+                    procedure = self._extract_procedure(record)
                 if procedure and procedure.get('proc_num'):
                     self._add_unique_item(
                         self.people[person_id]['procedures'],
@@ -356,6 +570,10 @@ class JSONProcessor:
                 print(f"[WARNING] Error processing record {i}: {e}")
                 continue
 
+        print(f"[INFO] Extracted {len(seen)} distinct sub-record slices from {self.record_count} records")
+
+        self.summary['generations'] = self._count_generations()
+
         # clean up so empty records are not present (thus reducing file-size)
         if True: # compress
             for person_id, person_data in self.people.items():
@@ -366,22 +584,255 @@ class JSONProcessor:
                     print(f"[WARNING] Error cleaning record {person_id}: {e}")
                     continue
 
-    def get_output_data(self) -> Dict[str, Any]:
+    def validate_pedigree(self) -> Dict[str, Any]:
+        """
+        Check the pedigree's integrity and record the findings in general["integrity"].
+
+        Run after process_records(). A single pass over people and their
+        parent/partner links finds references to people not in the family,
+        parents of the wrong sex, people who are their own parent, and then
+        ancestry cycles and people not connected to the proband, so the
+        client does not have to discover these while laying out the tree.
+
+        Returns:
+            Dictionary with 'valid' and a list for each kind of finding present
+        """
+        missing_references = []
+        wrong_sex_parents = []
+        self_parents = []
+        parents = {}
+        neighbors = defaultdict(list)
+
+        for person_id in sorted(self.people):
+            person = self.people[person_id]
+            parents[person_id] = []
+
+            for role, expected_sex in (('father', 'M'), ('mother', 'F')):
+                parent_id = person.get(role)
+                if not parent_id:
+                    continue
+                if parent_id == person_id:
+                    self_parents.append({'person': person_id, 'role': role})
+                    continue
+                if parent_id not in self.people:
+                    missing_references.append({'person': person_id, 'role': role, 'reference': parent_id})
+                    continue
+                parent_sex = self._sex(self.people[parent_id])
+                if parent_sex and parent_sex != expected_sex:
+                    wrong_sex_parents.append({'person': person_id, 'role': role, 'parent': parent_id})
+                parents[person_id].append(parent_id)
+                neighbors[person_id].append(parent_id)
+                neighbors[parent_id].append(person_id)
+
+            for partner in person.get('partners', []):
+                spouse_id = partner.get('spouse_id')
+                if not spouse_id or spouse_id == person_id:
+                    continue
+                if spouse_id not in self.people:
+                    missing_references.append({'person': person_id, 'role': 'partner', 'reference': spouse_id})
+                    continue
+                neighbors[person_id].append(spouse_id)
+                neighbors[spouse_id].append(person_id)
+
+        findings = {
+            'missing_references': missing_references,
+            'wrong_sex_parents': wrong_sex_parents,
+            'self_parents': self_parents,
+            'cycles': self._find_cycles(parents),
+            'disconnected': self._find_disconnected(neighbors)
+        }
+        integrity = {'valid': not any(findings.values())}
+        integrity.update({k: v for k, v in findings.items() if v})
+
+        self.general['integrity'] = integrity
+        if not integrity['valid']:
+            print(f"[WARNING] Pedigree integrity issues: {', '.join(k for k in integrity if k != 'valid')}")
+        return integrity
+
+    def _sex(self, person_data: Dict[str, Any]) -> str:
+        """Normalize a person's gender to 'M', 'F' or '' (unknown)."""
+        gender = str((person_data.get('demographics') or {}).get('gender', '')).strip().upper()
+        return gender[:1] if gender[:1] in ('M', 'F') else ''
+
+    def _find_cycles(self, parents: Dict[str, List[str]]) -> List[List[str]]:
+        """Find ancestry cycles with an iterative depth-first search over parent links."""
+        state = {}  # missing: unvisited, 1: on the current path, 2: done
+        cycles = []
+        for start in parents:
+            if start in state:
+                continue
+            path = [start]
+            stack = [iter(parents[start])]
+            state[start] = 1
+            while stack:
+                parent_id = next(stack[-1], None)
+                if parent_id is None:
+                    state[path.pop()] = 2
+                    stack.pop()
+                elif parent_id not in state:
+                    state[parent_id] = 1
+                    path.append(parent_id)
+                    stack.append(iter(parents[parent_id]))
+                elif state[parent_id] == 1:
+                    cycles.append(path[path.index(parent_id):])
+        return cycles
+
+    def _find_disconnected(self, neighbors: Dict[str, List[str]]) -> List[List[str]]:
+        """Group the people not connected to the proband (through parents or partners) into components."""
+        seen = set()
+        components = []
+        proband = self.general.get('proband')
+        starts = ([proband] if proband in self.people else []) + sorted(self.people)
+
+        for start in starts:
+            if start in seen:
+                continue
+            seen.add(start)
+            component = [start]
+            queue = [start]
+            while queue:
+                for next_id in neighbors.get(queue.pop(), ()):
+                    if next_id not in seen:
+                        seen.add(next_id)
+                        component.append(next_id)
+                        queue.append(next_id)
+            components.append(sorted(component))
+
+        # The first component is the proband's (when the proband is in the family)
+        return components[1:] if proband in self.people else components
+
+    def get_output_data(self, canonical: bool = False) -> Dict[str, Any]:
         """
         Get the processed data in the final output format.
 
+        Args:
+            canonical: Sort people, their partners/diseases/procedures and all
+                object keys so identical content always serializes identically
+
         Returns:
-            Dictionary with proband and people data
+            Dictionary with proband and people data, with a content digest in
+            general["digest"]
         """
         # generate updated last datetime stamp (in ISO 8601 formatted string)
         self.general["last_updated"] = datetime.now().isoformat()
 
-        return {
+        output_data = {
             #'proband': self.proband,
             'general': dict(self.general),
             'people': dict(self.people)  # Convert defaultdict to regular dict
         }
 
+        if canonical:
+            output_data['people'] = {
+                person_id: self._canonical_person(output_data['people'][person_id])
+                for person_id in sorted(output_data['people'])
+            }
+
+        self.general['digest'] = compute_digest(output_data)
+        output_data['general']['digest'] = self.general['digest']
+
+        if canonical:
+            output_data = _sort_keys(output_data)
+
+        return output_data
+
+    def restore_last_updated(self, output_data: Dict[str, Any], last_updated: str) -> None:
+        """
+        Keep the last_updated stamp of an existing processed file with the same digest.
+
+        get_output_data() stamps the current time; restoring the stored stamp
+        keeps the summary and manifest entry in step with the unchanged file.
+        """
+        self.general['last_updated'] = last_updated
+        output_data['general']['last_updated'] = last_updated
+
+    def _canonical_person(self, person_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a person with their sub-record lists in a stable order."""
+        person_data = dict(person_data)
+        for list_key, unique_key in (('partners', 'spouse_num'),
+                                     ('diseases', 'd_num'),
+                                     ('procedures', 'proc_num')):
+            if list_key in person_data:
+                person_data[list_key] = sorted(person_data[list_key],
+                                               key=lambda item: _sub_record_key(item.get(unique_key, '')))
+        return person_data
+
+    def get_summary_data(self) -> Dict[str, Any]:
+        """
+        Get the family summary written alongside the processed data.
+
+        The counts are gathered while process_records() runs, so list and
+        dashboard views can use them without reading the full document.
+
+        Returns:
+            Dictionary with the family headline fields and aggregate counts
+        """
+        return {
+            'study': self.general.get('study', ''),
+            'proband': self.general.get('proband', ''),
+            'family_classification': self.general.get('family_classification', ''),
+            'family_genetic_status': self.general.get('family_genetic_status', ''),
+            'last_updated': self.general.get('last_updated', ''),
+            'digest': self.general.get('digest', ''),
+            **self.summary
+        }
+
+SUB_RECORD_NUMBER = re.compile(r'^(\D*)(\d+(?:\.\d+)?)$')
+
+def _sub_record_key(value: Any) -> Tuple[str, int, float, str]:
+    """
+    Sort key for a sub-record number such as "C10", "P2" or "1".
+
+    Numbers sharing a prefix letter sort numerically (C1, C2, C10); anything
+    else sorts after them as plain text.
+    """
+    value = str(value)
+    match = SUB_RECORD_NUMBER.match(value)
+    if match:
+        return (match.group(1), 0, float(match.group(2)), value)
+    return (value, 1, 0.0, value)
+
+def _sort_keys(obj: Any) -> Any:
+    """Recursively rebuild dictionaries with their keys in sorted order."""
+    if isinstance(obj, dict):
+        return {k: _sort_keys(obj[k]) for k in sorted(obj)}
+    if isinstance(obj, list):
+        return [_sort_keys(item) for item in obj]
+    return obj
+
+def compute_digest(output_data: Dict[str, Any]) -> str:
+    """
+    Compute a SHA-256 digest of processed data, ignoring when it was produced.
+
+    general["last_updated"] and any previous general["digest"] are left out, so
+    re-processing identical content yields the same digest.
+
+    Args:
+        output_data: Processed family data
+
+    Returns:
+        Hex digest string
+    """
+    general = {k: v for k, v in output_data.get('general', {}).items()
+               if k not in ('last_updated', 'digest')}
+    content = dict(output_data, general=general)
+    serialized = json.dumps(content, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+def read_json_quietly(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Read an existing output file (processed file, summary or manifest).
+
+    Returns:
+        The parsed object, or None if the file is missing, unreadable or not an object
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
 def parse_json(file_path: str) -> Optional[Dict[str, Any]]:
     """
     Load and parse a JSON file.
@@ -442,12 +893,99 @@ def build_json_file(proband: str, general: Dict[str, str], people: Dict[str, Any
         jsonf.write(jsonString)
     print(f"[Info] JSON written to {output_path}")
 
+# Field delimiters of the supported delimited input formats
+DELIMITERS = {'csv': ',', 'tsv': '\t'}
+
+def detect_format(name: str) -> Tuple[str, bool]:
+    """
+    Detect the input format of a raw file from its name or S3 key.
+
+    Args:
+        name: File name or key, e.g. 'raw/lfs/F1.tsv.gz'
+
+    Returns:
+        Tuple of format ('json', 'csv' or 'tsv') and whether it is gzipped
+
+    Raises:
+        ValueError: If the suffix is not a supported format
+    """
+    suffixes = [suffix.lower() for suffix in Path(name).suffixes]
+    compressed = bool(suffixes) and suffixes[-1] == '.gz'
+    if compressed:
+        suffixes = suffixes[:-1]
+
+    input_format = suffixes[-1].lstrip('.') if suffixes else ''
+    if input_format not in ('json', *DELIMITERS):
+        raise ValueError(f"Unsupported input format: {name}")
+    return input_format, compressed
+
+def family_id_for(name: str) -> str:
+    """Return the family ID for a raw file name or key (raw/lfs/F1.csv.gz -> F1)."""
+    return Path(name).name.split('.')[0]
+
+# Name of the family manifest object maintained alongside the processed files
+MANIFEST_NAME = "manifest.json"
+
+def build_manifest_entry(output_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the manifest entry describing a single processed family.
+
+    Args:
+        output_data: Processed family data as returned by get_output_data()
+
+    Returns:
+        Dictionary with study, proband, person count and last_updated
+    """
+    general = output_data.get('general', {})
+    return {
+        'study': general.get('study', ''),
+        'proband': general.get('proband', ''),
+        'people': len(output_data.get('people', {})),
+        'last_updated': general.get('last_updated', '')
+    }
+
+def manifest_entry_matches(manifest: Optional[Dict[str, Any]], family_id: str,
+                           output_data: Dict[str, Any]) -> bool:
+    """Return True if the manifest already has this family's current entry."""
+    families = (manifest or {}).get('families', {})
+    return families.get(family_id) == build_manifest_entry(output_data)
+
+def update_manifest(manifest: Optional[Dict[str, Any]], family_id: str,
+                    output_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add or replace a family's entry in the family manifest.
+
+    Args:
+        manifest: Existing manifest (None or empty to start a new one)
+        family_id: Family identifier (processed file name without extension)
+        output_data: Processed family data as returned by get_output_data()
+
+    Returns:
+        The updated manifest, with families sorted by identifier
+    """
+    families = dict((manifest or {}).get('families', {}))
+    families[family_id] = build_manifest_entry(output_data)
+
+    return {
+        'last_updated': datetime.now().isoformat(),
+        'families': {k: families[k] for k in sorted(families)}
+    }
+
+def dump_manifest(manifest: Dict[str, Any]) -> str:
+    """Serialize the manifest compactly, as it is fetched on every page load."""
+    return json.dumps(manifest, separators=(',', ':'), ensure_ascii=False)
+
+def summary_path_for(output_path: Union[str, Path]) -> Path:
+    """Return the summary sidecar path for a processed file (X.processed.json -> X.summary.json)."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name.split('.')[0] + ".summary.json")
+
 # Optional main section for command-line execution
 def main():
     if len(sys.argv) != 5:
         print("Usage: python json2json.py <directory> <input_file> <reference_file> <output_file>")
         print("  directory: Base directory containing input files")
-        print("  input_file: Original input JSON file")
+        print("  input_file: Original input file (.json, .csv, .tsv, optionally .gz)")
         print("  reference_file: Reference output JSON file")
         print("  output_file: New output JSON file to create")
         sys.exit(1)
@@ -471,30 +1009,61 @@ def main():
         # Initialize processor
         processor = JSONProcessor()
 
-        # Load input data
-        input_data = processor.load_json(input_path)
-        if not isinstance(input_data, list):
-            raise ValueError("Input JSON must be a list of records")
+        # Load input data; CSV/TSV input is streamed rather than loaded up front
+        input_format, _ = detect_format(input_path.name)
+        if input_format == 'json':
+            input_data = processor.load_json(input_path)
+            if not isinstance(input_data, list):
+                raise ValueError("Input JSON must be a list of records")
+        else:
+            input_data = processor.load_delimited(input_path)
 
         # Load reference data (for debugging/comparison)
         try:
             reference_data = processor.load_json(reference_path)
             # Save formatted copies for debugging
-            processor.save_json(input_data, base_path / "debug/" / "debug_input.json")
+            if isinstance(input_data, list):
+                processor.save_json(input_data, base_path / "debug/" / "debug_input.json")
             processor.save_json(reference_data, base_path / "debug/" / "debug_reference.json")
         except Exception as e:
             print(f"[WARNING] Could not load reference file: {e}")
 
-        # Process the records
+        # Process the records and check the resulting pedigree
         processor.process_records(input_data)
+        processor.validate_pedigree()
+
+        # Generate the output. The processed file, summary and manifest are each
+        # written only if they differ, so a write that failed last time is retried
+        output_data = processor.get_output_data(canonical=True)
+        existing = (read_json_quietly(output_path) or {}).get('general', {})
+        if existing.get('digest') == output_data['general']['digest'] and existing.get('last_updated'):
+            print(f"[INFO] Output unchanged, skipping write: {output_path}")
+            processor.restore_last_updated(output_data, existing['last_updated'])
+        else:
+            processor.save_json(output_data, output_path)
 
-        # Generate and save output
-        output_data = processor.get_output_data()
-        processor.save_json(output_data, output_path)
+        summary_path = summary_path_for(output_path)
+        summary = processor.get_summary_data()
+        if read_json_quietly(summary_path) == summary:
+            print(f"[INFO] Summary unchanged, skipping write: {summary_path}")
+        else:
+            processor.save_json(summary, summary_path)
+
+        # Keep the family manifest in step with the processed folder
+        manifest_path = base_path / "processed/" / MANIFEST_NAME
+        manifest = read_json_quietly(manifest_path)
+        family_id = output_path.name.split('.')[0]
+        if manifest_entry_matches(manifest, family_id, output_data):
+            print(f"[INFO] Manifest entry unchanged, skipping write: {manifest_path}")
+        else:
+            manifest = update_manifest(manifest, family_id, output_data)
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                f.write(dump_manifest(manifest))
+            print(f"[INFO] Manifest updated: {manifest_path}")
 
         # Print summary
         print(f"[INFO] Processing complete!")
-        print(f"[INFO] Processed {len(input_data)} records")
+        print(f"[INFO] Processed {processor.record_count} records")
         print(f"[INFO] Generated data for {len(processor.people)} people")
         #print(f"[INFO] Proband: {processor.proband}")
 
@@ -1,10 +1,75 @@
 import boto3
+from botocore.exceptions import ClientError
 import json
-import os
-from json_processor import JSONProcessor
+import random
+import time
+from json_processor import (JSONProcessor, MANIFEST_NAME, manifest_entry_matches, update_manifest,
+                            dump_manifest, family_id_for)
 
 s3_client = boto3.client('s3')
 
+# Conditional manifest writes retried before giving up
+MANIFEST_ATTEMPTS = 5
+
+def get_s3_metadata(bucket_name, key):
+    """Return the user metadata of an existing object, or an empty dict if there is none."""
+    try:
+        response = s3_client.head_object(Bucket=bucket_name, Key=key)
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return {}
+        raise
+    return response.get('Metadata', {})
+
+def update_s3_manifest(bucket_name, family_id, output_data):
+    """
+    Add or replace a family's entry in processed/manifest.json.
+
+    The manifest is shared by every invocation, so the write is conditional on
+    the ETag that was read (or on the manifest not existing yet). If another
+    invocation wrote the manifest in between, it is read again and the update
+    is retried.
+    """
+    manifest_key = f"processed/{MANIFEST_NAME}"
+
+    for attempt in range(MANIFEST_ATTEMPTS):
+        try:
+            response = s3_client.get_object(Bucket=bucket_name, Key=manifest_key)
+            manifest = json.loads(response['Body'].read().decode('utf-8'))
+            condition = {'IfMatch': response['ETag']}
+        except s3_client.exceptions.NoSuchKey:
+            print(f"[INFO] No manifest at s3://{bucket_name}/{manifest_key}, creating one")
+            manifest = None
+            condition = {'IfNoneMatch': '*'}
+
+        if manifest_entry_matches(manifest, family_id, output_data):
+            print(f"[INFO] Manifest entry unchanged, skipping write to s3://{bucket_name}/{manifest_key}")
+            return
+
+        manifest = update_manifest(manifest, family_id, output_data)
+
+        try:
+            s3_client.put_object(
+                Bucket=bucket_name,
+                Key=manifest_key,
+                Body=dump_manifest(manifest),
+                ContentType='application/json',
+                CacheControl='max-age=60',
+                **condition
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise
+            print(f"[WARNING] Manifest changed while updating it (attempt {attempt + 1}), retrying")
+            time.sleep(random.uniform(0, 0.1 * 2 ** attempt))
+            continue
+
+        print(f"[INFO] Manifest updated at s3://{bucket_name}/{manifest_key}")
+        return
+
+    raise RuntimeError(f"Could not update s3://{bucket_name}/{manifest_key} "
+                       f"after {MANIFEST_ATTEMPTS} attempts")
+
 def lambda_handler(event, context):
     # Lookup table for subdirectory mappings
     lookup_table = {
@@ -60,45 +125,71 @@ def lambda_handler(event, context):
 
         try:
             response = s3_client.get_object(Bucket=s3_bucket_name, Key=s3_file_name)
-            file_content = response['Body'].read().decode('utf-8')
 
             # Initialize processor
             processor = JSONProcessor()
 
-            # Load input data
-            input_data = processor.load_s3_json(file_content)
-            if not isinstance(input_data, list):
-                raise ValueError("Input JSON must be a list of records")
+            # Load input data; the format (JSON, CSV or TSV, optionally gzipped) comes
+            # from the key suffix, and CSV/TSV rows are streamed from the object body
+            input_data = processor.load_s3_records(response['Body'], s3_file_name)
 
             # Process the records
             processor.process_records(input_data)
             print("[INFO] Processed records")
 
+            # Check parent references, sexes, cycles and connectivity to the proband
+            processor.validate_pedigree()
+
             # Generate and save output
-            output_data = processor.get_output_data()
+            output_data = processor.get_output_data(canonical=True)
+            digest = output_data['general']['digest']
 
             # 2. Serialize to JSON string
             json_string = json.dumps(output_data)
 
-            # 3. Upload to S3
-            filename_with_ext = os.path.basename(s3_file_name)
-            filename_without_ext = os.path.splitext(filename_with_ext)[0]
+            # 3. Upload to S3. The processed object, summary and manifest entry are each
+            # written only if they differ, so a write that failed last time is retried
+            filename_without_ext = family_id_for(s3_file_name)
             s3_object_key = f"processed/{filename_without_ext}.processed.json"
 
-            #s3 = boto3.client('s3')
-            s3_client.put_object(
-                Bucket=s3_bucket_name,
-                Key=s3_object_key,
-                Body=json_string,
-                ContentType='application/json'  # Specify the content type for proper handling
-            )
-            print(f"JSON data successfully dumped to s3://{s3_bucket_name}/{s3_object_key}")
+            existing = get_s3_metadata(s3_bucket_name, s3_object_key)
+            if existing.get('digest') == digest and existing.get('last-updated'):
+                print(f"[INFO] Output unchanged, skipping write to s3://{s3_bucket_name}/{s3_object_key}")
+                processor.restore_last_updated(output_data, existing['last-updated'])
+            else:
+                #s3 = boto3.client('s3')
+                s3_client.put_object(
+                    Bucket=s3_bucket_name,
+                    Key=s3_object_key,
+                    Body=json_string,
+                    ContentType='application/json',  # Specify the content type for proper handling
+                    Metadata={'digest': digest, 'last-updated': output_data['general']['last_updated']}
+                )
+                print(f"JSON data successfully dumped to s3://{s3_bucket_name}/{s3_object_key}")
+
+            # Write the small per-family summary sidecar used by list views
+            summary_key = f"processed/{filename_without_ext}.summary.json"
+            summary_metadata = {'digest': digest, 'last-updated': output_data['general']['last_updated']}
+            if get_s3_metadata(s3_bucket_name, summary_key) == summary_metadata:
+                print(f"[INFO] Summary unchanged, skipping write to s3://{s3_bucket_name}/{summary_key}")
+            else:
+                s3_client.put_object(
+                    Bucket=s3_bucket_name,
+                    Key=summary_key,
+                    Body=json.dumps(processor.get_summary_data()),
+                    ContentType='application/json',
+                    Metadata=summary_metadata
+                )
+                print(f"Summary successfully dumped to s3://{s3_bucket_name}/{summary_key}")
+
+            # 4. Refresh the family manifest used by the static site
+            update_s3_manifest(s3_bucket_name, filename_without_ext, output_data)
         except Exception as e:
             print(f"Error dumping JSON data to S3: {e}")
 
         # Print summary
         print(f"[INFO] Processing complete!")
-        print(f"[INFO] Processed {len(input_data)} records")
+        print(f"[INFO] Processed {processor.record_count} records")
         print(f"[INFO] Generated data for {len(processor.people)} people")
         print(f"[INFO] Proband: {processor.general['proband']}")
     else:
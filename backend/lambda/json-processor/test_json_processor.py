@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON processor
+
+These tests exercise JSONProcessor and its helpers directly, without S3.
+"""
+
+import csv
+import gzip
+import io
+import json
+import sys
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from json_processor import JSONProcessor, compute_digest, detect_format, manifest_entry_matches, update_manifest
+
+def create_test_data() -> list:
+    """Create a small two-person family in the raw input format."""
+    return [
+        {
+            "Merge1[project]": "LFS",
+            "Merge1[Subject]": "00101",
+            "Merge1[123a.result.participant.first_name]": "John",
+            "Merge1[123a.result.participant.last_name]": "Doe",
+            "CORE[FPT_ID3]": "00102",
+            "DEMO[SEX_OLD]": "M",
+            "Subject_cancer[CANCER.ICD03]": "C50.9 - Breast, NOS",
+            "Subject_cancer[CANCER.NUM]": "1",
+            "Subject_cancer[CANCER.AGE_AT_DIAGNOSIS]": "45"
+        },
+        {
+            "Merge1[project]": "LFS",
+            "Merge1[Subject]": "00102",
+            "Merge1[123a.result.participant.first_name]": "Robert",
+            "Merge1[123a.result.participant.last_name]": "Doe",
+            "DEMO[SEX_OLD]": "M",
+            "DEMO[DTHDAT_RAW]": "2001-01-01"
+        }
+    ]
+
+def process(records: list) -> dict:
+    processor = JSONProcessor()
+    processor.process_records(records)
+    return processor.get_output_data()
+
+def test_update_manifest():
+    output_data = process(create_test_data())
+
+    manifest = update_manifest(None, "FAM2", output_data)
+    manifest = update_manifest(manifest, "FAM1", output_data)
+
+    assert list(manifest["families"]) == ["FAM1", "FAM2"]
+    assert manifest["families"]["FAM1"] == {
+        "study": "LFS",
+        "proband": "00101",
+        "people": 2,
+        "last_updated": output_data["general"]["last_updated"]
+    }
+
+def test_manifest_entry_matches():
+    processor = JSONProcessor()
+    processor.process_records(create_test_data())
+    output_data = processor.get_output_data(canonical=True)
+    manifest = update_manifest(None, "FAM1", output_data)
+
+    assert manifest_entry_matches(manifest, "FAM1", output_data)
+    assert not manifest_entry_matches(manifest, "FAM2", output_data)
+    assert not manifest_entry_matches(None, "FAM1", output_data)
+
+    # Re-processing stamps a new time; restoring the stored stamp keeps the entry current
+    reprocessed = processor.get_output_data(canonical=True)
+    reprocessed["general"]["last_updated"] = "2000-01-01T00:00:00"
+    assert not manifest_entry_matches(manifest, "FAM1", reprocessed)
+    processor.restore_last_updated(reprocessed, output_data["general"]["last_updated"])
+    assert manifest_entry_matches(manifest, "FAM1", reprocessed)
+    assert processor.get_summary_data()["last_updated"] == output_data["general"]["last_updated"]
+
+def test_summary_data():
+    processor = JSONProcessor()
+    processor.process_records(create_test_data())
+    processor.get_output_data()
+
+    summary = processor.get_summary_data()
+
+    assert summary["proband"] == "00101"
+    assert summary["people"] == 2
+    assert summary["generations"] == 2
+    assert summary["cancers"] == 1
+    assert summary["earliest_cancer_age_of_diagnosis"] == 45
+    assert summary["deceased"] == 1
+    assert summary["family_classification"] == "NO-FAMILY-CLASSIFICATION"
+
+def test_summary_ignores_non_finite_ages():
+    records = create_test_data()
+    records.append(dict(records[0], **{
+        "Subject_cancer[CANCER.ICD03]": "C71.9 - Brain, NOS",
+        "Subject_cancer[CANCER.NUM]": "2",
+        "Subject_cancer[CANCER.AGE_AT_DIAGNOSIS]": "NaN"
+    }))
+    records.append(dict(records[0], **{
+        "Subject_cancer[CANCER.NUM]": "3",
+        "Subject_cancer[CANCER.AGE_AT_DIAGNOSIS]": "-inf"
+    }))
+
+    processor = JSONProcessor()
+    processor.process_records(records)
+    summary = processor.get_summary_data()
+
+    assert summary["cancers"] == 3
+    assert summary["earliest_cancer_age_of_diagnosis"] == 45
+    json.dumps(summary, allow_nan=False)
+
+def test_canonical_output_is_deterministic():
+    records = create_test_data()
+    second_cancer = dict(records[0], **{
+        "Subject_cancer[CANCER.ICD03]": "C71.9 - Brain, NOS",
+        "Subject_cancer[CANCER.NUM]": "2"
+    })
+    tenth_cancer = dict(records[0], **{
+        "Subject_cancer[CANCER.ICD03]": "C34.9 - Lung, NOS",
+        "Subject_cancer[CANCER.NUM]": "10"
+    })
+
+    first = JSONProcessor()
+    first.process_records([records[0], tenth_cancer, second_cancer, records[1]])
+    second = JSONProcessor()
+    second.process_records([second_cancer, records[1], tenth_cancer, records[0]])
+    first_data = first.get_output_data(canonical=True)
+    second_data = second.get_output_data(canonical=True)
+
+    assert first_data["general"]["digest"] == second_data["general"]["digest"]
+    assert first_data["general"]["digest"] == compute_digest(second_data)
+    assert [d["d_num"] for d in first_data["people"]["00101"]["diseases"]] == ["C1", "C2", "C10"]
+
+    first_data["general"].pop("last_updated")
+    second_data["general"].pop("last_updated")
+    assert first_data == second_data
+
+def test_join_expanded_rows_extract_each_slice_once():
+    subject, father = create_test_data()
+    # Every combination of the subject's two cancers and two procedures is a row
+    rows = [dict(subject, **{
+        "Subject_cancer[CANCER.ICD03]": f"C{cancer_num}0.9 - Cancer {cancer_num}",
+        "Subject_cancer[CANCER.NUM]": str(cancer_num),
+        "Subject procedure[PRTRT.ICD_9_STD]": f"85.4{procedure_num}",
+        "Subject procedure[PRTRT.NUMBER]": str(procedure_num)
+    }) for cancer_num in (1, 2) for procedure_num in (1, 2)]
+
+    calls = []
+    processor = JSONProcessor()
+    extract = processor._extract_cancer_disease
+    processor._extract_cancer_disease = lambda record: calls.append(record["Merge1[Subject]"]) or extract(record)
+    processor.process_records(rows + [father])
+    person = processor.get_output_data(canonical=True)["people"]["00101"]
+
+    assert calls == ["00101", "00101", "00102"]
+    assert [d["d_num"] for d in person["diseases"]] == ["C1", "C2"]
+    assert [p["proc_num"] for p in person["procedures"]] == ["P1", "P2"]
+
+def write_delimited(records: list, stream, delimiter: str) -> None:
+    columns = sorted({column for record in records for column in record})
+    writer = csv.DictWriter(stream, fieldnames=columns, delimiter=delimiter)
+    writer.writeheader()
+    writer.writerows(records)
+
+def test_detect_format():
+    assert detect_format("raw/lfs/F1.json") == ("json", False)
+    assert detect_format("raw/lfs/F1.CSV") == ("csv", False)
+    assert detect_format("raw/lfs/F1.tsv.gz") == ("tsv", True)
+
+def test_delimited_input_matches_json(tmp_path):
+    records = create_test_data()
+    tsv_path = tmp_path / "F1.tsv.gz"
+    with gzip.open(tsv_path, "wt", encoding="utf-8", newline="") as f:
+        write_delimited(records, f, "\t")
+
+    from_json = JSONProcessor()
+    from_json.process_records(records)
+    from_tsv = JSONProcessor()
+    from_tsv.process_records(from_tsv.load_delimited(tsv_path))
+
+    assert from_tsv.record_count == 2
+    assert (from_tsv.get_output_data(canonical=True)["general"]["digest"] ==
+            from_json.get_output_data(canonical=True)["general"]["digest"])
+
+def test_s3_csv_body_is_streamed():
+    text = io.StringIO()
+    write_delimited(create_test_data(), text, ",")
+    body = io.BytesIO(gzip.compress(text.getvalue().encode("utf-8")))
+
+    processor = JSONProcessor()
+    records = processor.load_s3_records(body, "raw/lfs/F1.csv.gz")
+
+    assert not isinstance(records, list)
+    processor.process_records(records)
+    assert sorted(processor.people) == ["00101", "00102"]
+
+def test_delimited_input_with_bom_and_line_separator(tmp_path):
+    records = create_test_data()
+    records[0]["Merge1[123a.result.participant.first_name]"] = "John\u2028Paul"
+    text = io.StringIO()
+    write_delimited(records, text, ",")
+    data = b"\xef\xbb\xbf" + text.getvalue().encode("utf-8")
+    csv_path = tmp_path / "F1.csv"
+    csv_path.write_bytes(data)
+
+    for key, body in (("raw/lfs/F1.csv", io.BytesIO(data)), ("raw/lfs/F1.csv.gz", io.BytesIO(gzip.compress(data)))):
+        processor = JSONProcessor()
+        processor.process_records(processor.load_s3_records(body, key))
+        assert processor.record_count == 2
+        # The byte order mark would otherwise end up in the first header, CORE[FPT_ID3]
+        assert processor.people["00101"]["father"] == "00102"
+        assert processor.people["00101"]["name"].startswith("John\u2028Paul")
+
+    from_file = JSONProcessor()
+    from_file.process_records(from_file.load_delimited(csv_path))
+    assert from_file.record_count == 2
+    assert from_file.people["00101"]["father"] == "00102"
+
+def test_validate_pedigree():
+    subject, father = create_test_data()
+    records = [
+        dict(subject, **{"CORE[MPT_ID3]": "00199"}),
+        dict(father, **{"CORE[MPT_ID3]": "00101"}),
+        {"Merge1[project]": "LFS", "Merge1[Subject]": "00104", "CORE[FPT_ID3]": "00104", "DEMO[SEX_OLD]": "F"},
+        {"Merge1[project]": "LFS", "Merge1[Subject]": "00105", "CORE[FPT_ID3]": "00104", "DEMO[SEX_OLD]": "M"}
+    ]
+
+    processor = JSONProcessor()
+    processor.process_records(records)
+    integrity = processor.validate_pedigree()
+
+    assert integrity["valid"] is False
+    assert integrity["missing_references"] == [{"person": "00101", "role": "mother", "reference": "00199"}]
+    assert integrity["wrong_sex_parents"] == [
+        {"person": "00102", "role": "mother", "parent": "00101"},
+        {"person": "00105", "role": "father", "parent": "00104"}
+    ]
+    assert integrity["self_parents"] == [{"person": "00104", "role": "father"}]
+    assert integrity["cycles"] == [["00101", "00102"]]
+    assert integrity["disconnected"] == [["00104", "00105"]]
+    assert processor.get_output_data()["general"]["integrity"] == integrity
+
+def test_validate_pedigree_missing_partner():
+    subject, father = create_test_data()
+    records = [dict(subject, **{"CORE[SPOUSE Num]": "1", "CORE[Value]": "00198"}), father]
+
+    processor = JSONProcessor()
+    processor.process_records(records)
+
+    # Only listed: the layout draws partners from shared children, not from spouse_id
+    assert processor.validate_pedigree() == {
+        "valid": False,
+        "missing_references": [{"person": "00101", "role": "partner", "reference": "00198"}]
+    }
+
+def test_validate_pedigree_valid_family():
+    processor = JSONProcessor()
+    processor.process_records(create_test_data())
+
+    assert processor.validate_pedigree() == {"valid": True}
@@ -5,14 +5,19 @@ Test script for the Lambda function
 This script tests the Lambda function with sample data to ensure it works correctly.
 """
 
+import io
 import json
 import os
 import sys
 from pathlib import Path
 
+from botocore.response import StreamingBody
+from botocore.stub import ANY, Stubber
+
 # Add the current directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
+import lambda_function
 from lambda_function import lambda_handler
 
 def create_test_event(bucket_name: str, object_key: str) -> dict:
@@ -113,6 +118,44 @@ def test_lambda_function():
         print(f"Error testing Lambda function: {e}")
         return False
 
+def manifest_response(manifest: dict, etag: str) -> dict:
+    body = json.dumps(manifest).encode('utf-8')
+    return {'Body': StreamingBody(io.BytesIO(body), len(body)), 'ETag': etag}
+
+def test_update_s3_manifest_retries_when_manifest_changes(monkeypatch):
+    """A manifest written by another invocation is re-read rather than overwritten."""
+    monkeypatch.setattr(lambda_function.time, 'sleep', lambda seconds: None)
+    output_data = {'general': {'study': 'LFS', 'proband': '00101', 'last_updated': '2025-01-01T12:00:00'},
+                   'people': {'00101': {}}}
+    manifest_key = {'Bucket': 'test-data-bucket', 'Key': 'processed/manifest.json'}
+    put_params = dict(manifest_key, Body=ANY, ContentType=ANY, CacheControl=ANY)
+
+    with Stubber(lambda_function.s3_client) as stub:
+        stub.add_client_error('get_object', service_error_code='NoSuchKey', http_status_code=404,
+                              expected_params=manifest_key)
+        stub.add_client_error('put_object', service_error_code='PreconditionFailed', http_status_code=412,
+                              expected_params=dict(put_params, IfNoneMatch='*'))
+        stub.add_response('get_object', manifest_response({'families': {'00201': {}}}, '"v1"'),
+                          expected_params=manifest_key)
+        stub.add_response('put_object', {}, expected_params=dict(put_params, IfMatch='"v1"'))
+
+        lambda_function.update_s3_manifest('test-data-bucket', '00101', output_data)
+        stub.assert_no_pending_responses()
+
+def test_update_s3_manifest_skips_current_entry():
+    """A manifest that already has the family's entry is not rewritten."""
+    output_data = {'general': {'study': 'LFS', 'proband': '00101', 'last_updated': '2025-01-01T12:00:00'},
+                   'people': {'00101': {}}}
+    manifest = {'families': {'00101': {'study': 'LFS', 'proband': '00101', 'people': 1,
+                                       'last_updated': '2025-01-01T12:00:00'}}}
+
+    with Stubber(lambda_function.s3_client) as stub:
+        stub.add_response('get_object', manifest_response(manifest, '"v1"'),
+                          expected_params={'Bucket': 'test-data-bucket', 'Key': 'processed/manifest.json'})
+
+        lambda_function.update_s3_manifest('test-data-bucket', '00101', output_data)
+        stub.assert_no_pending_responses()
+
 if __name__ == "__main__":
     success = test_lambda_function()
     sys.exit(0 if success else 1) 
\ No newline at end of file
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed FHH Family Store
+
+This module loads processed family documents (the output of JSONProcessor) and
+their annotations into an embedded SQLite database, so the web tier can list,
+filter and read families with indexed queries instead of directory scans and
+full-file parses.
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS families (
+    family_id TEXT PRIMARY KEY,
+    study TEXT,
+    proband TEXT,
+    family_classification TEXT,
+    family_genetic_status TEXT,
+    last_updated TEXT,
+    digest TEXT,
+    general TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS people (
+    family_id TEXT NOT NULL REFERENCES families(family_id) ON DELETE CASCADE,
+    person_id TEXT NOT NULL,
+    name TEXT,
+    gender TEXT,
+    born TEXT,
+    deceased TEXT,
+    father TEXT,
+    mother TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (family_id, person_id)
+);
+
+CREATE TABLE IF NOT EXISTS diseases (
+    family_id TEXT NOT NULL REFERENCES families(family_id) ON DELETE CASCADE,
+    person_id TEXT NOT NULL,
+    d_num TEXT NOT NULL,
+    code TEXT,
+    shorthand TEXT,
+    age_of_diagnosis TEXT,
+    date_of_diagnosis TEXT,
+    PRIMARY KEY (family_id, person_id, d_num)
+);
+
+CREATE TABLE IF NOT EXISTS procedures (
+    family_id TEXT NOT NULL REFERENCES families(family_id) ON DELETE CASCADE,
+    person_id TEXT NOT NULL,
+    proc_num TEXT NOT NULL,
+    code TEXT,
+    shorthand TEXT,
+    age_at_procedure TEXT,
+    date_of_procedure TEXT,
+    PRIMARY KEY (family_id, person_id, proc_num)
+);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    family_id TEXT PRIMARY KEY REFERENCES families(family_id) ON DELETE CASCADE,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS annotations (
+    family_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_families_study ON families(study);
+CREATE INDEX IF NOT EXISTS idx_people_person ON people(person_id);
+CREATE INDEX IF NOT EXISTS idx_diseases_code ON diseases(code);
+CREATE INDEX IF NOT EXISTS idx_procedures_code ON procedures(code);
+"""
+
+# Columns of the families table that list_families() can filter on
+FAMILY_FILTERS = ('study', 'proband', 'family_classification', 'family_genetic_status')
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """Return a file's modification time and size, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+class FamilyStore:
+    """
+    An embedded SQLite store of processed families and their annotations.
+
+    The store opens one connection and shares it between threads behind a
+    lock, so the database is opened once rather than on every request (the
+    Flask development server handles each request on a new thread).
+
+    The store is filled from the processed and annotations folders by
+    load_folders(), and refresh() repeats that periodically so families
+    processed after startup are picked up. Files whose modification time and
+    size have not changed since they were last loaded are not parsed again.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = str(db_path)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._stamps = {}
+        self._loaded_at = None
+        self.create_schema()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared connection for a block of work, opening it on first use."""
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA foreign_keys = ON")
+                conn.execute("PRAGMA journal_mode = WAL")
+                self._conn = conn
+            yield self._conn
+
+    def close(self) -> None:
+        """Close the shared connection, if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def create_schema(self) -> None:
+        """Create the tables and indexes if they do not already exist."""
+        with self.connection() as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def load_family(self, family_id: str, output_data: Dict[str, Any]) -> None:
+        """
+        Load (or replace) one processed family document.
+
+        Args:
+            family_id: Family identifier (processed file name without extension)
+            output_data: Processed family data as produced by JSONProcessor
+        """
+        general = output_data.get('general', {})
+        people = output_data.get('people', {})
+
+        with self.connection() as conn, conn:
+            conn.execute("DELETE FROM families WHERE family_id = ?", (family_id,))
+            conn.execute(
+                "INSERT INTO families VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (family_id, general.get('study'), general.get('proband'),
+                 general.get('family_classification'), general.get('family_genetic_status'),
+                 general.get('last_updated'), general.get('digest'), json.dumps(general))
+            )
+            conn.executemany(
+                "INSERT INTO people VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(family_id, person_id, person.get('name'),
+                  person.get('demographics', {}).get('gender'), person.get('born'),
+                  person.get('deceased'), person.get('father'), person.get('mother'),
+                  json.dumps(person))
+                 for person_id, person in people.items()]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO diseases VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(family_id, person_id, d.get('d_num'), d.get('code'), d.get('shorthand'),
+                  d.get('age_of_diagnosis'), d.get('date_of_diagnosis'))
+                 for person_id, person in people.items()
+                 for d in person.get('diseases', []) if d.get('d_num')]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO procedures VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(family_id, person_id, p.get('proc_num'), p.get('code'), p.get('shorthand'),
+                  p.get('age_at_procedure'), p.get('date_of_procedure'))
+                 for person_id, person in people.items()
+                 for p in person.get('procedures', []) if p.get('proc_num')]
+            )
+        print(f"[INFO] Loaded family {family_id} ({len(people)} people)")
+
+    def load_folders(self, processed_folder: Union[str, Path],
+                     annotations_folder: Optional[Union[str, Path]] = None) -> int:
+        """
+        Load every *.processed.json (with its *.summary.json sidecar) and
+        *.annotations.json file from disk.
+
+        Files unchanged since this store last loaded them are skipped, as are
+        families whose stored digest matches the file's digest. Families whose
+        processed file has been removed are deleted.
+
+        Args:
+            processed_folder: Folder of processed family files
+            annotations_folder: Optional folder of annotation files
+
+        Returns:
+            Number of families (re)loaded
+        """
+        with self._lock:
+            loaded = 0
+            with self.connection() as conn:
+                digests = {row['family_id']: row['digest'] for row in
+                           conn.execute("SELECT family_id, digest FROM families")}
+
+            for path in sorted(Path(processed_folder).glob('*.processed.json')):
+                family_id = path.name.split('.')[0]
+                stored = family_id in digests
+                stored_digest = digests.pop(family_id, None)
+                summary_path = path.with_name(family_id + ".summary.json")
+                stamp = (_file_stamp(path), _file_stamp(summary_path))
+                if stored and self._stamps.get(path) == stamp:
+                    continue
+
+                with open(path, 'r', encoding='utf-8') as f:
+                    output_data = json.load(f)
+                digest = output_data.get('general', {}).get('digest')
+                if not stored or not digest or stored_digest != digest:
+                    self.load_family(family_id, output_data)
+                    loaded += 1
+                if stamp[1] is not None:
+                    with open(summary_path, 'r', encoding='utf-8') as f:
+                        self.save_summary(family_id, f.read())
+                self._stamps[path] = stamp
+
+            # Whatever is left was stored earlier but no longer has a processed file
+            if digests:
+                with self.connection() as conn, conn:
+                    conn.executemany("DELETE FROM families WHERE family_id = ?",
+                                     [(family_id,) for family_id in digests])
+                print(f"[INFO] Removed {len(digests)} families no longer in {processed_folder}")
+
+            if annotations_folder and Path(annotations_folder).is_dir():
+                for path in sorted(Path(annotations_folder).glob('*.annotations.json')):
+                    stamp = _file_stamp(path)
+                    if self._stamps.get(path) == stamp:
+                        continue
+                    with open(path, 'r', encoding='utf-8') as f:
+                        self.save_annotations(path.name.split('.')[0], f.read())
+                    self._stamps[path] = stamp
+
+            self._loaded_at = time.monotonic()
+            return loaded
+
+    def refresh(self, processed_folder: Union[str, Path],
+                annotations_folder: Optional[Union[str, Path]] = None,
+                interval: float = 5.0) -> int:
+        """
+        Re-run load_folders() if it last ran more than `interval` seconds ago.
+
+        Returns:
+            Number of families (re)loaded
+        """
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < interval:
+                return 0
+            return self.load_folders(processed_folder, annotations_folder)
+
+    def list_families(self, code: Optional[str] = None, **filters: str) -> List[Dict[str, Any]]:
+        """
+        List families, optionally filtered.
+
+        Args:
+            code: Only families with a person who has this disease or procedure code
+            **filters: Exact matches on study, proband, family_classification
+                or family_genetic_status
+
+        Returns:
+            List of family rows (without the full documents)
+        """
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in FAMILY_FILTERS:
+                raise ValueError(f"Unknown family filter: {column}")
+            if value:
+                clauses.append(f"f.{column} = ?")
+                params.append(value)
+        if code:
+            clauses.append("f.family_id IN (SELECT family_id FROM diseases WHERE code = ?"
+                           " UNION SELECT family_id FROM procedures WHERE code = ?)")
+            params.extend([code, code])
+
+        query = ("SELECT f.family_id, f.study, f.proband, f.family_classification,"
+                 " f.family_genetic_status, f.last_updated, f.digest,"
+                 " (SELECT COUNT(*) FROM people p WHERE p.family_id = f.family_id) AS people"
+                 " FROM families f")
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY f.family_id"
+
+        with self.connection() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def get_family(self, family_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild a processed family document.
+
+        Returns:
+            Dictionary with general and people data, or None if not found
+        """
+        with self.connection() as conn:
+            row = conn.execute("SELECT general FROM families WHERE family_id = ?",
+                               (family_id,)).fetchone()
+            if row is None:
+                return None
+
+            people = {person['person_id']: json.loads(person['data']) for person in
+                      conn.execute("SELECT person_id, data FROM people WHERE family_id = ?"
+                                   " ORDER BY person_id", (family_id,))}
+        return {'general': json.loads(row['general']), 'people': people}
+
+    def get_digest(self, family_id: str) -> Optional[str]:
+        """
+        Return a family's content digest, or None if the family is not stored.
+
+        Families processed before digests were recorded fall back to their
+        last_updated stamp, which still changes whenever they are re-processed.
+        """
+        with self.connection() as conn:
+            row = conn.execute("SELECT digest, last_updated FROM families WHERE family_id = ?",
+                               (family_id,)).fetchone()
+        return (row['digest'] or row['last_updated'] or '') if row else None
+
+    def get_person(self, family_id: str, person_id: str) -> Optional[Dict[str, Any]]:
+        """Return one person's processed data, or None if not found."""
+        with self.connection() as conn:
+            row = conn.execute("SELECT data FROM people WHERE family_id = ? AND person_id = ?",
+                               (family_id, person_id)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def find_people_by_code(self, code: str) -> List[Dict[str, str]]:
+        """Return the family and person IDs of everyone with a disease or procedure code."""
+        with self.connection() as conn:
+            return [dict(row) for row in conn.execute(
+                "SELECT family_id, person_id FROM diseases WHERE code = ?"
+                " UNION SELECT family_id, person_id FROM procedures WHERE code = ?"
+                " ORDER BY family_id, person_id", (code, code))]
+
+    def get_summary(self, family_id: str) -> Optional[str]:
+        """Return a family's summary sidecar as the JSON string that was loaded, or None."""
+        with self.connection() as conn:
+            row = conn.execute("SELECT data FROM summaries WHERE family_id = ?",
+                               (family_id,)).fetchone()
+        return row['data'] if row else None
+
+    def save_summary(self, family_id: str, data: str) -> None:
+        """Store a loaded family's summary JSON string, replacing any previous version."""
+        with self.connection() as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?)", (family_id, data))
+
+    def get_annotations(self, family_id: str) -> Optional[str]:
+        """Return a family's annotations as the JSON string that was saved, or None."""
+        with self.connection() as conn:
+            row = conn.execute("SELECT data FROM annotations WHERE family_id = ?",
+                               (family_id,)).fetchone()
+        return row['data'] if row else None
+
+    def save_annotations(self, family_id: str, data: str) -> None:
+        """Store a family's annotations JSON string, replacing any previous version."""
+        with self.connection() as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO annotations VALUES (?, ?)", (family_id, data))
+
+# Optional main section for command-line execution
+def main():
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python family_store.py <database> <processed_folder> [annotations_folder]")
+        print("  database: SQLite database file to create or update")
+        print("  processed_folder: Folder containing *.processed.json files")
+        print("  annotations_folder: Optional folder containing *.annotations.json files")
+        sys.exit(1)
+
+    try:
+        store = FamilyStore(sys.argv[1])
+        loaded = store.load_folders(*sys.argv[2:])
+        print(f"[INFO] Loaded {loaded} families into {sys.argv[1]}")
+    except Exception as e:
+        print(f"[ERROR] Loading failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
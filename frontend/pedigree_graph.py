@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+FHH Pedigree Graph
+
+This module builds a graph of a processed family from each person's
+father/mother/partners fields, so the web tier can return a bounded part of
+a large pedigree (a few generations around a person, or the nuclear families
+they belong to) instead of the whole document.
+"""
+
+from collections import defaultdict, deque
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+class PedigreeGraph:
+    """
+    Parent, child and partner links between the people of one processed family.
+
+    Links to people who are not in the family are ignored.
+    """
+
+    def __init__(self, people: Dict[str, Dict[str, Any]]):
+        self.people = people
+        self.parents = defaultdict(list)
+        self.children = defaultdict(list)
+        self.partners = defaultdict(set)
+
+        for person_id, person in people.items():
+            for key in ('father', 'mother'):
+                parent_id = person.get(key)
+                # The same ID recorded as both father and mother is one parent, not two
+                if (parent_id in people and parent_id != person_id
+                        and parent_id not in self.parents[person_id]):
+                    self.parents[person_id].append(parent_id)
+                    self.children[parent_id].append(person_id)
+
+            for partner in person.get('partners', []):
+                spouse_id = partner.get('spouse_id')
+                if spouse_id in people and spouse_id != person_id:
+                    self._link_partners(person_id, spouse_id)
+
+            # Parents of a shared child are partners even if no spouse is recorded
+            if len(self.parents[person_id]) == 2:
+                self._link_partners(*self.parents[person_id])
+
+        for children in self.children.values():
+            children.sort()
+
+    def _link_partners(self, first: str, second: str) -> None:
+        if first == second:
+            return
+        self.partners[first].add(second)
+        self.partners[second].add(first)
+
+    def _walk(self, start: str, links: Dict[str, List[str]], generations: int) -> Set[str]:
+        """Breadth-first walk along parent or child links, up to a number of generations."""
+        found = {start}
+        queue = deque([(start, 0)])
+        while queue:
+            person_id, depth = queue.popleft()
+            if depth == generations:
+                continue
+            for next_id in links.get(person_id, ()):
+                if next_id not in found:
+                    found.add(next_id)
+                    queue.append((next_id, depth + 1))
+        return found
+
+    def ancestors(self, person_id: str, generations: int) -> Set[str]:
+        """Return the person and their ancestors up to a number of generations."""
+        self._check(person_id)
+        return self._walk(person_id, self.parents, generations)
+
+    def descendants(self, person_id: str, generations: int) -> Set[str]:
+        """Return the person and their descendants down to a number of generations."""
+        self._check(person_id)
+        return self._walk(person_id, self.children, generations)
+
+    def neighborhood(self, person_id: str, up: int, down: int) -> Set[str]:
+        """
+        Return the people within a number of generations of a person.
+
+        Ancestors up to `up` generations and descendants down to `down`
+        generations are included, along with the partners of everyone found
+        so that each couple can be drawn together.
+        """
+        found = self.ancestors(person_id, up) | self.descendants(person_id, down)
+        return found | {p for member in found for p in self.partners.get(member, ())}
+
+    def nuclear_families(self, person_id: str) -> Set[str]:
+        """
+        Return the people in a person's nuclear families.
+
+        That is their family of origin (parents and siblings) and their
+        families of procreation (partners and children).
+        """
+        self._check(person_id)
+        found = {person_id}
+        for parent_id in self.parents.get(person_id, ()):
+            found.add(parent_id)
+            found.update(self.children.get(parent_id, ()))
+        found.update(self.partners.get(person_id, ()))
+        found.update(self.children.get(person_id, ()))
+        return found
+
+    def subgraph(self, person_ids: Iterable[str], focus: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build a response containing a subset of the family.
+
+        Args:
+            person_ids: People to include
+            focus: Person the subset was built around
+
+        Returns:
+            Dictionary with the selected people (in processed format), the focus
+            person, and for each person with relatives left out, which links
+            ('parents', 'children', 'partners') lead outside the subset
+        """
+        selected = set(person_ids)
+        truncated = {}
+        for person_id in sorted(selected):
+            links = [name for name, related in (('parents', self.parents),
+                                                ('children', self.children),
+                                                ('partners', self.partners))
+                     if any(other not in selected for other in related.get(person_id, ()))]
+            if links:
+                truncated[person_id] = links
+
+        return {
+            'focus': focus,
+            'people': {person_id: self.people[person_id] for person_id in sorted(selected)},
+            'truncated': truncated
+        }
+
+    def _check(self, person_id: str) -> None:
+        if person_id not in self.people:
+            raise KeyError(f"Person not in family: {person_id}")
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+FHH Pedigree SVG Renderer
+
+This module renders a processed family as the same pedigree SVG that
+fhh_display_pedigree.js draws in the browser, using a frontend/config/*.json
+style. It is a port of the layout in fhh_build_pedigree.js (organize_parents,
+organize_children, set_locations, ...) and the drawing in
+fhh_display_pedigree.js (draw_frame, draw_person, draw_connector, ...), so
+pedigrees can be printed or exported in bulk without opening each one.
+
+Rendered SVGs are cached on disk, keyed by the family digest plus the config
+digest, and whole studies can be rendered in parallel from the command line.
+"""
+
+import copy
+import hashlib
+import json
+import math
+import os
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+SVG_NS = "http://www.w3.org/2000/svg"
+CONFIG_FOLDER = Path(__file__).parent / 'config'
+
+def _fmt(value: Any) -> str:
+    """Format an attribute value the way JavaScript converts numbers to strings."""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        if value.is_integer():
+            return str(int(value))
+        return repr(value)
+    return str(value)
+
+def _num(person: Dict[str, Any], key: str) -> float:
+    """Read a layout number with JavaScript semantics (missing -> NaN, null -> 0)."""
+    if key not in person:
+        return math.nan
+    value = person[key]
+    return 0 if value is None else value
+
+def _js_round(value: float) -> float:
+    """Math.round(): round half up, passing NaN through."""
+    return value if math.isnan(value) else math.floor(value + 0.5)
+
+def _digest(obj: Any) -> str:
+    serialized = json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+def load_config(config_name: str) -> Dict[str, Any]:
+    """Load a style from frontend/config/<config_name>.json."""
+    with open(CONFIG_FOLDER / (config_name + ".json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class PedigreeRenderer:
+    """
+    Lay out and draw one processed family as an SVG document.
+
+    A renderer holds the layout state of a single render(), mirroring the
+    module-level state of fhh_build_pedigree.js, so create one per family
+    (or call render() again, which resets it).
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+
+    def render(self, family_data: Dict[str, Any],
+               annotations: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Render a family to an SVG string.
+
+        Args:
+            family_data: Processed family (general and people data)
+            annotations: Optional saved annotations; saved positions override the layout
+
+        Returns:
+            SVG document as a string
+        """
+        # Layout adds placeholder people and positions, so work on a copy
+        self.people = copy.deepcopy(family_data.get('people', {}))
+        self.proband = family_data.get('proband') or family_data.get('general', {}).get('proband')
+        self.annotations = annotations
+        self.family_tree = []
+        self.furthest_left = 0
+        self.furthest_right = 0
+        self._organized = set()
+        self._organizing = set()
+
+        self._organize_parents(self.proband, 0, "proband")
+        self._set_locations(self.family_tree)
+
+        self.svg = self._draw_frame()
+        self._draw_family_tree()
+
+        return ET.tostring(self.svg, encoding='unicode')
+
+    # Layout (fhh_build_pedigree.js)
+
+    def _oldest_generation(self) -> int:
+        return min([0] + [p['gen'] for p in self.people.values() if p.get('gen') is not None])
+
+    def _youngest_generation(self) -> int:
+        return max([0] + [p['gen'] for p in self.people.values() if p.get('gen') is not None])
+
+    def _gender(self, person_id: str) -> str:
+        return (self.people[person_id].get('demographics') or {}).get('gender', '')
+
+    def _find_all_children(self, person_id: str) -> List[str]:
+        return [candidate_id for candidate_id, candidate in self.people.items()
+                if person_id in (candidate.get('mother'), candidate.get('father'))]
+
+    def _find_all_children_from_both_parents(self, person_id: str, partner_id: str) -> List[str]:
+        children = []
+        for candidate_id, candidate in self.people.items():
+            mother, father = candidate.get('mother'), candidate.get('father')
+            if ((father == person_id and mother == partner_id) or
+                    (mother == person_id and father == partner_id) or
+                    (father == person_id and partner_id == "UNKNOWN" and mother is None) or
+                    (mother == person_id and partner_id == "UNKNOWN" and father is None)):
+                if candidate_id not in children:
+                    children.append(candidate_id)
+        return children
+
+    def _find_all_partners(self, person_id: str) -> List[str]:
+        """Partners are the other parents of a person's children; missing ones become placeholders."""
+        if not person_id:
+            return []
+        partners = []
+        for child_id in self._find_all_children(person_id):
+            father_id = self.people[child_id].get('father')
+            mother_id = self.people[child_id].get('mother')
+            if father_id and father_id != person_id and father_id not in partners:
+                partners.append(father_id)
+            if mother_id and mother_id != person_id and mother_id not in partners:
+                partners.append(mother_id)
+
+            gen = self.people.get(person_id, {}).get('gen')
+            if not mother_id:
+                self.people[child_id]['mother'] = self._create_placeholder_partner(person_id, gen, "mother")
+            if not father_id:
+                self.people[child_id]['father'] = self._create_placeholder_partner(person_id, gen, "father")
+        return partners
+
+    def _create_placeholder_partner(self, person_id: str, gen: int, role: str) -> str:
+        if role == "mother":
+            placeholder = {'placeholder': True, 'gen': gen, 'demographics': {'gender': "Female"},
+                           'name': "Mother of " + person_id, 'id': "m_" + person_id}
+        else:
+            placeholder = {'placeholder': True, 'gen': gen, 'demographics': {'gender': "Male"},
+                           'name': "Father of " + person_id, 'id': "f_" + person_id}
+        self.people[placeholder['id']] = placeholder
+        self._place_person(placeholder['id'], gen, "unknown")
+        return placeholder['id']
+
+    def _organize_parents(self, person_id: str, gen: int, side: str) -> None:
+        # Revisiting a person changes nothing, and skipping it stops runaway recursion on cycles
+        if not person_id or person_id not in self.people or person_id in self._organized:
+            return
+        self._organized.add(person_id)
+        person = self.people[person_id]
+
+        self._organize_children(person_id, gen + 1, side)
+
+        mother_id, father_id = person.get('mother'), person.get('father')
+        if mother_id or father_id:
+            if not mother_id or not father_id:
+                # create_placeholder_parent() only re-places the child
+                self._place_person(person_id, gen - 1, side)
+
+            if side == "proband":
+                self._organize_parents(person.get('mother'), gen - 1, "maternal")
+                self._organize_parents(person.get('father'), gen - 1, "paternal")
+            else:
+                self._organize_parents(person.get('mother'), gen - 1, side)
+                self._organize_parents(person.get('father'), gen - 1, side)
+
+        self._place_person(person_id, gen, side)
+
+    def _organize_children(self, person_id: str, gen: int, side: str) -> None:
+        # A person already being organized is their own descendant (a cycle); stop there
+        if person_id in self.family_tree or person_id in self._organizing:
+            return
+        self._organizing.add(person_id)
+        for child_id in self._find_all_children(person_id):
+            self._organize_children(child_id, gen + 1, side)
+        self._organizing.discard(person_id)
+        self._place_person(person_id, gen, side)
+
+        for partner_id in self._find_all_partners(person_id):
+            self._organize_children(partner_id, gen, side)
+            self._place_person(partner_id, gen, side)
+
+    def _place_person(self, person_id: str, gen: int, side: str) -> None:
+        if not person_id or person_id == "UNKNOWN" or person_id not in self.people:
+            return
+        if person_id not in self.family_tree:
+            self.people[person_id]['gen'] = gen
+            self.people[person_id]['side'] = side
+            self.people[person_id]['id'] = person_id
+            self.family_tree.append(person_id)
+
+    def _set_locations(self, family_tree: List[str]) -> None:
+        for person_id in list(family_tree):
+            partners = self._find_all_partners(person_id)
+            if len(partners) > 1:
+                self._find_location_of_multiple_partners(person_id)
+                continue
+
+            person = self.people[person_id]
+            midpoint = self._midpoint(self._find_all_children(person_id))
+            if midpoint is None:
+                if person.get('side') in ("maternal", "proband"):
+                    self.furthest_left -= 2
+                    person['loc'] = self.furthest_left
+                else:
+                    self.furthest_right += 2
+                    person['loc'] = self.furthest_right
+            elif self._gender(person_id) == "Female":
+                person['loc'] = midpoint - 1
+            else:
+                person['loc'] = midpoint
+
+    def _find_location_of_multiple_partners(self, person_id: str) -> None:
+        for partner_id in self._find_all_partners(person_id):
+            midpoint = self._midpoint(self._find_all_children_from_both_parents(person_id, partner_id))
+            if partner_id not in self.people:
+                return
+            # In JavaScript null - 1 is -1, while the null itself is stored as is
+            before = -1 if midpoint is None else midpoint - 1
+            if self._gender(person_id) == "Female":
+                self.people[person_id]['loc'] = before
+                self.people[partner_id]['loc'] = midpoint
+            else:
+                self.people[person_id]['loc'] = midpoint
+                self.people[partner_id]['loc'] = before
+
+    def _midpoint(self, children: List[str]) -> Optional[float]:
+        if not children:
+            return None
+        first = _num(self.people[children[0]], 'loc')
+        last = _num(self.people[children[-1]], 'loc')
+        return _js_round((last + first) / 2)
+
+    # Drawing (fhh_display_pedigree.js)
+
+    def _element(self, tag: str, attributes: Dict[str, Any]) -> ET.Element:
+        elem = ET.SubElement(self.svg, tag)
+        for name, value in attributes.items():
+            elem.set(name, _fmt(value))
+        return elem
+
+    def _draw_frame(self) -> ET.Element:
+        config = self.config
+        total_width = self.furthest_right - self.furthest_left + 1
+        oldest_generation = self._oldest_generation()
+        num_generations = self._youngest_generation() - oldest_generation + 1
+
+        self.center_offset = {
+            'x': config['margin'] + (-self.furthest_left * config['h_spacing']),
+            'y': config['margin'] + (-oldest_generation * config['v_spacing'])
+        }
+
+        width = (2 * config['margin']) + (total_width * config['h_spacing'])
+        height = (2 * config['margin']) + (num_generations * config['v_spacing'])
+
+        svg = ET.Element('svg', {
+            'xmlns': SVG_NS, 'viewBox': f"0 0 {_fmt(width)} {_fmt(height)}",
+            'width': _fmt(width), 'height': _fmt(height), 'fill': "lightblue",
+            'stroke': "black", 'stroke-width': "5", 'style': "display: block;", 'id': "svg"
+        })
+        self.svg = svg
+        self._element('rect', {'width': width - 2, 'height': height - 2, 'x': 1, 'y': 1,
+                               'stroke-width': "2", 'stroke': "black", 'fill': "white"})
+        return svg
+
+    def _draw_family_tree(self) -> None:
+        drawn = [person_id for person_id, person in self.people.items()
+                 if person.get('gen') is not None and person.get('loc') is not None]
+        for person_id in drawn:
+            person = self.people[person_id]
+            self._draw_connector(person_id, person.get('mother'), person.get('father'))
+        for person_id in drawn:
+            self._draw_person(person_id)
+        self._draw_proband_arrow()
+
+    def _get_center(self, person: Dict[str, Any]) -> Dict[str, float]:
+        positions = (self.annotations or {}).get('positions') or {}
+        saved_position = positions.get(person.get('id'))
+        if saved_position:
+            return {'x': saved_position['x'], 'y': saved_position['y']}
+        return {
+            'x': self.center_offset['x'] + self.config['margin'] + _num(person, 'loc') * self.config['h_spacing'],
+            'y': self.center_offset['y'] + self.config['margin'] + _num(person, 'gen') * self.config['v_spacing']
+        }
+
+    def _draw_person(self, person_id: str) -> None:
+        person = self.people[person_id]
+        center = self._get_center(person)
+        person['x'], person['y'] = center['x'], center['y']
+        size = self.config['size']
+        gender = self._gender(person_id)
+
+        if gender == "Male":
+            elem = self._element('rect', {'width': size, 'height': size, 'x': center['x'] - size / 2,
+                                          'y': center['y'] - size / 2, 'stroke-width': "1",
+                                          'id': person_id, 'name': person_id, 'sex': "Male"})
+        elif gender == "Female":
+            elem = self._element('circle', {'r': size / 2, 'cx': center['x'], 'cy': center['y'],
+                                            'stroke-width': "1", 'id': person_id, 'name': person_id,
+                                            'sex': "Female"})
+        else:
+            x, y, s = center['x'], center['y'], size
+            points = (f"{_fmt(x)},{_fmt(y - s / 2)} {_fmt(x + s / 2)},{_fmt(y)} "
+                      f"{_fmt(x)},{_fmt(y + s / 2)} {_fmt(x - s / 2)},{_fmt(y)}")
+            elem = self._element('polygon', {'points': points, 'stroke-width': "1", 'id': person_id,
+                                             'name': person_id, 'sex': "Unknown",
+                                             'cx': center['x'], 'cy': center['y']})
+
+        if person.get('placeholder'):
+            elem.set('fill', "White")
+        else:
+            self._draw_quadrants(person_id, center, gender)
+            self._draw_name(center, person_id)
+
+        if person.get('deceased'):
+            s = size / 2
+            self._element('line', {'x1': center['x'] - s, 'y1': center['y'] + s,
+                                   'x2': center['x'] + s, 'y2': center['y'] - s,
+                                   'stroke-width': "1", 'id': person_id})
+
+    def _draw_quadrants(self, person_id: str, center: Dict[str, float], gender: str) -> None:
+        """
+        Fill the quadrants of a person's symbol configured in config["quadrants"].
+
+        Quadrants are numbered clockwise from the upper left; one is filled when
+        any of the person's diseases (or procedures) has a code or shorthand
+        starting with the quadrant's code.
+        """
+        person = self.people[person_id]
+        x, y, s = center['x'], center['y'], self.config['size'] / 2
+        corners = [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+
+        for index, quadrant in enumerate(self.config.get('quadrants', [])[:4]):
+            items = person.get('procedures' if quadrant.get('type') == 'procedure' else 'diseases', [])
+            code = str(quadrant.get('code', ''))
+            if not code or not any(str(item.get(k) or '').startswith(code)
+                                   for item in items for k in ('code', 'shorthand')):
+                continue
+
+            dx, dy = corners[index]
+            if gender == "Male":
+                path = f"M{_fmt(x)},{_fmt(y)} h{_fmt(dx * s)} v{_fmt(dy * s)} h{_fmt(-dx * s)} Z"
+            elif gender == "Female":
+                sweep = 1 if dx * dy > 0 else 0
+                path = (f"M{_fmt(x)},{_fmt(y)} h{_fmt(dx * s)} "
+                        f"A{_fmt(s)},{_fmt(s)} 0 0 {sweep} {_fmt(x)},{_fmt(y + dy * s)} Z")
+            else:
+                path = f"M{_fmt(x)},{_fmt(y)} h{_fmt(dx * s)} L{_fmt(x)},{_fmt(y + dy * s)} Z"
+            self._element('path', {'d': path, 'fill': "black", 'stroke-width': "1", 'id': person_id})
+
+    def _draw_name(self, center: Dict[str, float], person_id: str) -> None:
+        loc_x = center['x']
+        loc_y = center['y'] + self.config['size'] / 2 + self.config['v_padding']
+        self._draw_label(person_id, loc_x, loc_y).set('id', person_id)
+
+        name = self.people[person_id].get('name')
+        if name and name != "Unknown":
+            self._draw_label(name, loc_x, loc_y + 14).set('id', person_id)
+
+    def _draw_label(self, text: str, x: float, y: float) -> ET.Element:
+        elem = self._element('text', {'x': x, 'y': y, 'font-size': 12,
+                                      'font-family': "Arial, Helvetica, sans-serif",
+                                      'text-anchor': "middle", 'fill': "black", 'stroke-width': "1"})
+        elem.text = text
+        return elem
+
+    def _draw_connector(self, person_id: str, mother_id: Optional[str], father_id: Optional[str]) -> None:
+        mother = self.people.get(mother_id) if mother_id else None
+        father = self.people.get(father_id) if father_id else None
+        if not (mother and father):
+            return
+
+        child_loc = self._get_center(self.people[person_id])
+        mother_loc = self._get_center(mother)
+        father_loc = self._get_center(father)
+        half_spacing = self.config['v_spacing'] / 2
+        parents_x = (mother_loc['x'] + father_loc['x']) / 2
+
+        # Top of child, line between parents, down from parents, parents to child
+        self._element('line', {'x1': child_loc['x'], 'y1': child_loc['y'], 'x2': child_loc['x'],
+                               'y2': child_loc['y'] - half_spacing, 'stroke-width': "2",
+                               'id': person_id})
+        self._element('line', {'x1': mother_loc['x'], 'y1': mother_loc['y'], 'x2': father_loc['x'],
+                               'y2': father_loc['y'], 'stroke-width': "2",
+                               'mother_id': mother_id, 'father_id': father_id})
+        self._element('line', {'x1': parents_x, 'y1': mother_loc['y'], 'x2': parents_x,
+                               'y2': mother_loc['y'] + half_spacing, 'stroke-width': "2",
+                               'p_mother_id': mother_id, 'p_father_id': father_id})
+        self._element('line', {'x1': parents_x, 'y1': mother_loc['y'] + half_spacing,
+                               'x2': child_loc['x'], 'y2': child_loc['y'] - half_spacing,
+                               'stroke-width': "2", 'child_id': person_id,
+                               'c_mother_id': mother_id, 'c_father_id': father_id})
+
+    def _draw_proband_arrow(self) -> None:
+        proband = self.people.get(self.proband)
+        if not proband or 'x' not in proband:
+            return
+        x, y, half = proband['x'], proband['y'], self.config['size'] / 2
+
+        if self._gender(self.proband) == "Male":
+            line = (x + half + 3, y + 17, x + half + 32, y + 32)
+            triangle = (x + half + 3, y + 17, x + half + 21, y + 18, x + half + 14, y + 30)
+        else:
+            d = half * .7071
+            line = (x - d - 7, y + d - 5, x - d - 37, y + d + 15)
+            triangle = (x - d - 7, y + d - 5, x - d - 24, y + (d - 3), x - d - 16, y + d + 10)
+
+        self._element('line', {'x1': line[0], 'y1': line[1], 'x2': line[2], 'y2': line[3],
+                               'stroke-width': "2", 'id': self.proband})
+        points = " ".join(f"{_fmt(triangle[i])},{_fmt(triangle[i + 1])}" for i in range(0, 6, 2))
+        self._element('polygon', {'points': points, 'stroke-width': "1", 'fill': "black",
+                                  'cx': triangle[0], 'cy': triangle[1], 'id': self.proband})
+
+class RenderCache:
+    """
+    On-disk cache of rendered SVGs.
+
+    Entries are keyed by the family digest (general["digest"] from the
+    processor, or a hash of the document) plus a digest of the config and of
+    any annotations, so a changed family, style or saved layout renders anew.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+
+    def key(self, family_data: Dict[str, Any], config: Dict[str, Any],
+            annotations: Optional[Dict[str, Any]] = None) -> str:
+        family_digest = family_data.get('general', {}).get('digest') or _digest(family_data)
+        return self.digest_key(family_digest, config, annotations)
+
+    def digest_key(self, family_digest: str, config: Dict[str, Any],
+                   annotations: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key from a family digest already at hand, without the document."""
+        key = f"{family_digest[:32]}-{_digest(config)[:32]}"
+        if annotations:
+            key += f"-{_digest(annotations)[:32]}"
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached SVG for a key, or None if it has not been rendered."""
+        path = self.cache_dir / (key + ".svg")
+        return path.read_text(encoding='utf-8') if path.is_file() else None
+
+    def render(self, family_data: Dict[str, Any], config: Dict[str, Any],
+               annotations: Optional[Dict[str, Any]] = None, key: Optional[str] = None) -> str:
+        """
+        Return the cached SVG for a family and config, rendering and storing it if missing.
+
+        Args:
+            family_data: Processed family (general and people data)
+            config: Pedigree style
+            annotations: Optional saved annotations
+            key: Cache key, if the caller built it with digest_key()
+
+        Returns:
+            SVG document as a string
+        """
+        key = key or self.key(family_data, config, annotations)
+        svg = self.get(key)
+        if svg is not None:
+            return svg
+
+        path = self.cache_dir / (key + ".svg")
+        svg = PedigreeRenderer(config).render(family_data, annotations)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a uniquely named file then rename, so parallel renders (threads
+        # or processes) never share a temp file or see a partial SVG
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(svg)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        return svg
+
+def _render_file(processed_path: Path, output_dir: Path, config: Dict[str, Any],
+                 cache_dir: Path) -> Path:
+    """Render one processed file into the output folder (run in a worker process)."""
+    with open(processed_path, 'r', encoding='utf-8') as f:
+        family_data = json.load(f)
+
+    output_path = output_dir / (processed_path.name.split('.')[0] + ".svg")
+    output_path.write_text(RenderCache(cache_dir).render(family_data, config), encoding='utf-8')
+    return output_path
+
+def render_folder(processed_folder: Union[str, Path], output_folder: Union[str, Path],
+                  config: Dict[str, Any], study: Optional[str] = None,
+                  cache_dir: Optional[Union[str, Path]] = None,
+                  workers: Optional[int] = None) -> List[Path]:
+    """
+    Render every processed family (optionally of one study) in parallel.
+
+    Args:
+        processed_folder: Folder of *.processed.json files
+        output_folder: Folder to write <family>.svg files into
+        config: Pedigree style
+        study: Only render families of this study
+        cache_dir: Render cache folder (default: <output_folder>/.render_cache)
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        Paths of the SVG files written
+    """
+    processed_folder, output_folder = Path(processed_folder), Path(output_folder)
+    cache_dir = Path(cache_dir) if cache_dir else output_folder / ".render_cache"
+    output_folder.mkdir(parents=True, exist_ok=True)
+
+    paths = sorted(processed_folder.glob('*.processed.json'))
+    if study:
+        # The manifest (or a summary sidecar) names each family's study without a full parse
+        manifest_path = processed_folder / "manifest.json"
+        families = {}
+        if manifest_path.is_file():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                families = json.load(f).get('families', {})
+        selected = []
+        for path in paths:
+            family_id = path.name.split('.')[0]
+            if family_id in families:
+                family_study = families[family_id].get('study')
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    family_study = json.load(f).get('general', {}).get('study')
+            if family_study == study:
+                selected.append(path)
+        paths = selected
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_render_file, path, output_folder, config, cache_dir) for path in paths]
+        written = []
+        for path, future in zip(paths, futures):
+            try:
+                written.append(future.result())
+            except Exception as e:
+                print(f"[WARNING] Could not render {path.name}: {e}")
+
+    print(f"[INFO] Rendered {len(written)} of {len(paths)} families to {output_folder}")
+    return written
+
+# Optional main section for command-line execution
+def main():
+    if len(sys.argv) not in (3, 4, 5):
+        print("Usage: python pedigree_svg.py <processed_folder> <output_folder> [config_name] [study]")
+        print("  processed_folder: Folder containing *.processed.json files")
+        print("  output_folder: Folder to write <family>.svg files into")
+        print("  config_name: Style in frontend/config (default: basic)")
+        print("  study: Only render families of this study")
+        sys.exit(1)
+
+    try:
+        processed_folder, output_folder = sys.argv[1:3]
+        config_name = sys.argv[3] if len(sys.argv) > 3 else "basic"
+        study = sys.argv[4] if len(sys.argv) > 4 else None
+        render_folder(processed_folder, output_folder, load_config(config_name), study)
+    except Exception as e:
+        print(f"[ERROR] Rendering failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -345,6 +345,21 @@ function get_midpoint_of_children_from_both_parents(person_id, partner_id) {
 
 /////////////
 
+// The layout follows father/mother links only: organize_parents recurses forever on a
+// cycle or a person who is their own parent, and fails on a parent who is not in the
+// family. Partners come from shared children, so a missing spouse_id does no harm.
+export function find_layout_blocking_findings(integrity) {
+  if (!integrity || integrity.valid) return [];
+
+  let blocking = [];
+  if (integrity["cycles"] && integrity["cycles"].length > 0) blocking.push("cycles");
+  if (integrity["self_parents"] && integrity["self_parents"].length > 0) blocking.push("self_parents");
+  const missing_parents = (integrity["missing_references"] || []).filter(
+    finding => finding.role == "father" || finding.role == "mother");
+  if (missing_parents.length > 0) blocking.push("missing_references");
+  return blocking;
+}
+
 export function check_for_unplaced_people() {
   let missing_people = [];
 
@@ -3,7 +3,8 @@ import {  set_data, determine_age, find_children, find_all_partners, find_childr
           expand_one_generation_to_include_partners, expand_next_generation_to_include_all_children,
           determine_sex, find_orphaned_people, place_orphaned_people, find_in_tree,
           find_first_in_generation, find_last_in_generation, set_all_locations,
-          find_parent_of_male_in_couple, find_parent_of_female_in_couple
+          find_parent_of_male_in_couple, find_parent_of_female_in_couple,
+          find_layout_blocking_findings
        } from './fhh_build_pedigree';
 
 import d from './fhh_pedigree.test.json';
@@ -270,3 +271,27 @@ test("Test find_parent_of_couple", () => {
   const boys_parent = find_parent_of_male_in_couple(boy_couple, family_tree);
   console.log (boys_parent);
 });
+
+test("Test that only parent findings block the layout", () => {
+  expect(find_layout_blocking_findings(undefined)).toEqual([]);
+  expect(find_layout_blocking_findings({"valid": true})).toEqual([]);
+
+  // A spouse who was not exported is reported, but the family is still drawn
+  const missing_partner = {
+    "valid": false,
+    "missing_references": [{"person": "10001-01-004", "role": "partner", "reference": "10001-09-001"}]
+  };
+  expect(find_layout_blocking_findings(missing_partner)).toEqual([]);
+
+  const missing_mother = {
+    "valid": false,
+    "missing_references": [
+      {"person": "10001-01-004", "role": "partner", "reference": "10001-09-001"},
+      {"person": "10001-03-001", "role": "mother", "reference": "10001-09-002"}
+    ],
+    "cycles": [["10001-01-004", "10001-02-016"]]
+  };
+  expect(find_layout_blocking_findings(missing_mother)).toEqual(["cycles", "missing_references"]);
+  expect(find_layout_blocking_findings({"valid": false, "self_parents": [{"person": "10001-01-004", "role": "father"}]}))
+    .toEqual(["self_parents"]);
+});
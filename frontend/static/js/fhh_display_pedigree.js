@@ -1,7 +1,8 @@
 
 import {   build_entire_family_tree, set_data, get_data,
             get_furthest_left, get_furthest_right, get_generation_count, get_youngest_generation, get_oldest_generation,
-            check_for_overlaps, check_for_unplaced_people, reset_furthest_locations
+            check_for_overlaps, check_for_unplaced_people, reset_furthest_locations,
+            find_layout_blocking_findings
         } from './fhh_build_pedigree.js';
 
 import { check_for_files, load_files_into_select, load_config_and_data, save_positions_and_annotations } from "./fhh_load.js";
@@ -96,6 +97,15 @@ export function display_pedigree() {
   console.log(annotations);
   set_data(data);
 
+  // Check the processor's integrity findings before laying the family out, as
+  // build_entire_family_tree cannot handle some of them; report those and stop
+  if (has_layout_blocking_findings()) {
+    family_tree = [];
+    document.getElementById("main").innerHTML = '';
+    add_alert_bar(false);
+    return;
+  }
+
   reset_furthest_locations();
   console.log(get_furthest_left() );
   const proband_id = data.proband;
@@ -110,13 +120,21 @@ export function display_pedigree() {
 
 }
 
-function add_alert_bar() {
+function add_alert_bar(drawn = true) {
   let active_alerts = false;
   const alert_elem = document.getElementById("alert");
   alert_elem.innerHTML = "";
 
-  active_alerts |= add_overlap_alerts(alert_elem);
-  active_alerts |= add_unplaced_people_alerts(alert_elem);
+  active_alerts |= add_integrity_alerts(alert_elem);
+  if (drawn) {
+    active_alerts |= add_overlap_alerts(alert_elem);
+    active_alerts |= add_unplaced_people_alerts(alert_elem);
+  } else {
+    const p = document.createElement("p");
+    p.classList.add("alert-line");
+    alert_elem.append(p)
+    p.append("Pedigree not drawn: fix the cycles, own parents and missing parents above first");
+  }
 
   if (!active_alerts) {
     alert_elem.style.backgroundColor = "white";
@@ -124,6 +142,44 @@ function add_alert_bar() {
   }
 }
 
+function has_layout_blocking_findings() {
+  const integrity = data["general"] ? data["general"]["integrity"] : null;
+  return find_layout_blocking_findings(integrity).length > 0;
+}
+
+// The processor records integrity findings in general.integrity, so they are reported without re-checking the tree
+function add_integrity_alerts(alert_elem) {
+  const integrity = data["general"] ? data["general"]["integrity"] : null;
+  if (!integrity || integrity.valid) return false;
+
+  const labels = {
+    "missing_references": "Missing References: ",
+    "wrong_sex_parents": "Parents of Wrong Sex: ",
+    "self_parents": "Own Parent: ",
+    "cycles": "Cycles: ",
+    "disconnected": "Disconnected: "
+  };
+
+  alert_elem.style.backgroundColor = "#FDD";
+  alert_elem.style.border = '4px dashed #F00';
+  for (const kind in labels) {
+    if (!integrity[kind]) continue;
+    const p = document.createElement("p");
+    p.classList.add("alert-line");
+    alert_elem.append(p)
+    p.append(labels[kind]);
+    for (const index in integrity[kind]) {
+      const finding = integrity[kind][index];
+      let text;
+      if (Array.isArray(finding)) text = finding.join(", ");
+      else text = finding.person + " " + finding.role + " " + (finding.reference || finding.parent || "");
+      const button = create_button(text.trim());
+      p.append(button);
+    }
+  }
+  return true;
+}
+
 function add_overlap_alerts(alert_elem) {
   const overlaps = check_for_overlaps(family_tree);
 
@@ -1,6 +1,6 @@
 
 export async function check_for_files() {
-  await getFileList("/list_of_families");
+  await getFileList("manifest.json");
 }
 
 export function load_files_into_select(file_list) {
@@ -34,19 +34,14 @@ async function getFileList(url) {
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
-    const filelist_text = await response.text();
-    const filelist = JSON.parse(filelist_text);
-
-    let family_list = [];
-    for (const i in filelist) {
-      const filename = filelist[i];
-      const family = filename.split('.')[0];
-      family_list.push(family);
-    }
+    const manifest = await response.json();
+
+    // The manifest is keyed by family id, so no per-file name parsing is needed
+    let family_list = Object.keys(manifest.families || {});
 
     family_list.sort();
     load_files_into_select(family_list);
-    return files;
+    return family_list;
   } catch (error) {
     console.error("Error fetching file list:", error);
     return [];
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite family store
+
+These tests load small processed families into a temporary database.
+"""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from family_store import FamilyStore
+
+def create_family(proband: str = "00101", digest: str = "d1") -> dict:
+    """Create a small processed family: a proband, their father and their mother."""
+    return {
+        "general": {"study": "LFS", "proband": proband, "family_classification": "LFS",
+                    "last_updated": "2025-01-01T12:00:00", "digest": digest},
+        "people": {
+            proband: {"name": "John Doe", "father": "00102", "mother": "00103",
+                      "demographics": {"gender": "Male"},
+                      "diseases": [{"d_num": "C1", "code": "C50.9", "age_of_diagnosis": "45"}]},
+            "00102": {"name": "Robert Doe", "demographics": {"gender": "Male"},
+                      "procedures": [{"proc_num": "P1", "code": "85.41"}]},
+            "00103": {"name": "Jane Doe", "demographics": {"gender": "Female"}}
+        }
+    }
+
+def write_family(folder: Path, family_id: str, data: dict, summary: dict = None) -> None:
+    """Write a processed file (and optionally its summary), as the processor would."""
+    for suffix, content in ((".processed.json", data), (".summary.json", summary)):
+        if content is None:
+            continue
+        path = folder / f"{family_id}{suffix}"
+        previous = path.stat().st_mtime_ns if path.exists() else 0
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(content, f)
+        # Make a rewrite look changed even where the file system clock is coarse
+        mtime = max(path.stat().st_mtime_ns, previous + 10**9)
+        os.utime(path, ns=(mtime, mtime))
+
+def test_load_and_read_family(tmp_path):
+    store = FamilyStore(tmp_path / "families.db")
+    store.load_family("F1", create_family())
+
+    assert store.get_family("F1") == create_family()
+    assert store.get_family("F2") is None
+    assert store.get_person("F1", "00103") == create_family()["people"]["00103"]
+    assert store.get_person("F1", "00199") is None
+    assert store.get_digest("F1") == "d1"
+
+def test_list_families_and_codes(tmp_path):
+    store = FamilyStore(tmp_path / "families.db")
+    store.load_family("F1", create_family())
+    other = create_family(proband="00201")
+    other["general"]["study"] = "RAS"
+    store.load_family("F2", other)
+
+    assert [f["family_id"] for f in store.list_families()] == ["F1", "F2"]
+    assert [f["family_id"] for f in store.list_families(study="RAS")] == ["F2"]
+    assert store.list_families(study="LFS")[0]["people"] == 3
+    assert [f["family_id"] for f in store.list_families(code="85.41")] == ["F1", "F2"]
+    assert store.find_people_by_code("C50.9") == [{"family_id": "F1", "person_id": "00101"},
+                                                  {"family_id": "F2", "person_id": "00201"}]
+
+def test_load_folders_skips_unchanged_and_removes_deleted(tmp_path):
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    write_family(processed, "F1", create_family())
+    write_family(processed, "F2", create_family(proband="00201"))
+    store = FamilyStore(tmp_path / "families.db")
+
+    assert store.load_folders(processed) == 2
+    assert store.load_folders(processed) == 0
+
+    (processed / "F2.processed.json").unlink()
+    write_family(processed, "F1", create_family(digest="d2"))
+    assert store.load_folders(processed) == 1
+    assert [f["family_id"] for f in store.list_families()] == ["F1"]
+    assert store.get_digest("F1") == "d2"
+    assert store.get_person("F2", "00201") is None
+
+def test_load_folders_parses_only_changed_files(tmp_path, monkeypatch):
+    write_family(tmp_path, "F1", create_family(), summary={"people": 3})
+    write_family(tmp_path, "F2", create_family(proband="00201"))
+    store = FamilyStore(tmp_path / "families.db")
+    store.load_folders(tmp_path)
+    assert json.loads(store.get_summary("F1")) == {"people": 3}
+    assert store.get_summary("F2") is None
+
+    parsed = []
+    load = json.load
+    monkeypatch.setattr(json, "load", lambda f: parsed.append(Path(f.name).name) or load(f))
+
+    assert store.load_folders(tmp_path) == 0
+    assert parsed == []
+
+    # A new summary is picked up without reloading the unchanged family
+    write_family(tmp_path, "F2", create_family(proband="00201"), summary={"people": 4})
+    assert store.load_folders(tmp_path) == 0
+    assert parsed == ["F2.processed.json"]
+    assert json.loads(store.get_summary("F2")) == {"people": 4}
+
+def test_refresh_waits_for_interval(tmp_path):
+    store = FamilyStore(tmp_path / "families.db")
+    store.load_folders(tmp_path)
+    write_family(tmp_path, "F1", create_family())
+
+    assert store.refresh(tmp_path, interval=60) == 0
+    assert store.get_family("F1") is None
+    assert store.refresh(tmp_path, interval=0) == 1
+    assert store.get_family("F1") == create_family()
+
+def test_annotations(tmp_path):
+    annotations = tmp_path / "annotations"
+    annotations.mkdir()
+    (annotations / "F1.annotations.json").write_text('{"00101": {"note": "x"}}', encoding="utf-8")
+    store = FamilyStore(tmp_path / "families.db")
+
+    store.load_folders(tmp_path, annotations)
+    assert store.get_annotations("F1") == '{"00101": {"note": "x"}}'
+    store.save_annotations("F1", "{}")
+    assert store.get_annotations("F1") == "{}"
+    assert store.get_annotations("F2") is None
+
+def test_connection_is_shared_between_threads(tmp_path):
+    store = FamilyStore(tmp_path / "families.db")
+    store.load_family("F1", create_family())
+    results, connections = [], []
+
+    def read():
+        with store.connection() as conn:
+            connections.append(conn)
+        results.append(store.get_digest("F1"))
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["d1"] * 4
+    assert len({id(conn) for conn in connections}) == 1
+    store.close()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the pedigree graph
+
+These tests build a small three-generation family and check the bounded
+subsets the web tier returns from it.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from pedigree_graph import PedigreeGraph
+
+def create_people() -> dict:
+    """
+    Grandparents 001 and 002 have children 003 and 004; 003 and their spouse
+    005 have 006, who has 008 with 007. 004's mother 099 is not in the family.
+    """
+    return {
+        "001": {"partners": [{"spouse_id": "002"}]},
+        "002": {},
+        "003": {"father": "001", "mother": "002", "partners": [{"spouse_id": "005"}]},
+        "004": {"father": "001", "mother": "099"},
+        "005": {},
+        "006": {"father": "003", "mother": "005"},
+        "007": {"partners": [{"spouse_id": "006"}]},
+        "008": {"father": "006", "mother": "007"}
+    }
+
+def test_links():
+    graph = PedigreeGraph(create_people())
+
+    assert graph.parents["003"] == ["001", "002"]
+    assert graph.parents["004"] == ["001"]
+    assert graph.children["001"] == ["003", "004"]
+    assert graph.partners["006"] == {"007"}
+    assert "099" not in graph.children
+
+def test_ancestors_and_descendants():
+    graph = PedigreeGraph(create_people())
+
+    assert graph.ancestors("008", 1) == {"008", "006", "007"}
+    assert graph.ancestors("008", 2) == {"008", "006", "007", "003", "005"}
+    assert graph.descendants("001", 1) == {"001", "003", "004"}
+    assert graph.descendants("001", 3) == {"001", "003", "004", "006", "008"}
+    assert graph.ancestors("001", 0) == {"001"}
+
+def test_neighborhood_includes_partners():
+    graph = PedigreeGraph(create_people())
+
+    assert graph.neighborhood("006", up=1, down=1) == {"003", "005", "006", "007", "008"}
+
+def test_nuclear_families_and_truncated_links():
+    graph = PedigreeGraph(create_people())
+    people = graph.nuclear_families("003")
+
+    assert people == {"001", "002", "003", "004", "005", "006"}
+
+    subgraph = graph.subgraph(people, focus="003")
+    assert subgraph["focus"] == "003"
+    assert list(subgraph["people"]) == ["001", "002", "003", "004", "005", "006"]
+    assert subgraph["truncated"] == {"006": ["children", "partners"]}
+
+def test_unknown_person():
+    graph = PedigreeGraph(create_people())
+
+    with pytest.raises(KeyError):
+        graph.neighborhood("999", up=1, down=1)
+    with pytest.raises(KeyError):
+        graph.nuclear_families("999")
+
+def test_same_parent_recorded_as_father_and_mother():
+    people = {"010": {}, "011": {"father": "010", "mother": "010"}, "012": {"father": "012"}}
+    graph = PedigreeGraph(people)
+
+    assert graph.parents["011"] == ["010"]
+    assert graph.children["010"] == ["011"]
+    assert not graph.partners.get("010")
+    assert not graph.parents.get("012")
+    assert graph.nuclear_families("011") == {"010", "011"}
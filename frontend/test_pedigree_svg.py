@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the server-side pedigree renderer
+
+The layout is checked against the positions fhh_build_pedigree.js assigns to
+the sample family in static/js/fhh_pedigree.test.json.
+"""
+
+import json
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from pedigree_svg import PedigreeRenderer, RenderCache, load_config, render_folder
+from test_family_store import create_family
+
+SAMPLE_FAMILY = Path(__file__).parent / "static" / "js" / "fhh_pedigree.test.json"
+
+# [gen, loc] of each person after build_entire_family_tree() in fhh_build_pedigree.js
+SAMPLE_LAYOUT = {
+    "10001-01-004": [1, -4], "10001-01-005": [1, -5], "10001-01-006": [1, -8],
+    "10001-01-007": [1, -10], "10001-01-012": [1, -18], "10001-01-013": [1, -13],
+    "10001-01-014": [1, -17], "10001-01-015": [1, -20], "10001-02-016": [0, -13],
+    "10001-02-017": [0, -12], "10001-02-018": [0, -22], "10001-02-019": [0, -24],
+    "10001-03-001": [2, -2], "10001-03-002": [2, -4], "10001-03-003": [2, -6],
+    "10001-03-008": [2, -12], "10001-03-009": [2, -14], "10001-03-010": [2, -16],
+    "10001-03-011": [2, -18], "10001-04-021": [-1, -18], "m_10001-04-021": [-1, -19]
+}
+
+def test_layout_matches_javascript():
+    with open(SAMPLE_FAMILY, encoding="utf-8") as f:
+        family_data = json.load(f)
+
+    renderer = PedigreeRenderer(load_config("basic"))
+    svg = renderer.render(family_data)
+
+    layout = {person_id: [person.get("gen"), person.get("loc")]
+              for person_id, person in renderer.people.items()}
+    assert layout == SAMPLE_LAYOUT
+    assert ET.fromstring(svg).tag.endswith("svg")
+    # The caller's document is left as it was
+    assert "m_10001-04-021" not in family_data["people"]
+
+def elements(svg: str, tag: str) -> list:
+    """Return the elements of an SVG document with a tag, ignoring the namespace."""
+    return [elem for elem in ET.fromstring(svg).iter() if elem.tag.split('}')[-1] == tag]
+
+def symbols(svg: str, tag: str) -> list:
+    """Return the IDs of the people drawn with a symbol (rect, circle or polygon)."""
+    return sorted(elem.get("id") for elem in elements(svg, tag) if elem.get("sex"))
+
+def test_symbols_by_sex_and_proband_arrow():
+    svg = PedigreeRenderer(load_config("basic")).render(create_family())
+
+    assert symbols(svg, "rect") == ["00101", "00102"]
+    assert symbols(svg, "circle") == ["00103"]
+    assert symbols(svg, "polygon") == []
+    # The proband arrow is a filled triangle at the end of a line, beside the male proband's square
+    arrow = [elem for elem in elements(svg, "polygon") if elem.get("id") == "00101"]
+    assert [elem.get("fill") for elem in arrow] == ["black"]
+    assert any((line.get("x1"), line.get("y1")) == (arrow[0].get("cx"), arrow[0].get("cy"))
+               for line in elements(svg, "line") if line.get("id") == "00101")
+    square = [elem for elem in elements(svg, "rect") if elem.get("id") == "00101"][0]
+    assert float(arrow[0].get("cx")) > float(square.get("x")) + float(square.get("width"))
+
+def test_cycle_and_missing_parent_do_not_break_layout():
+    family_data = create_family()
+    family_data["people"]["00102"]["father"] = "00101"   # 00101 -> 00102 -> 00101
+    family_data["people"]["00103"]["mother"] = "00199"   # not in the family
+
+    renderer = PedigreeRenderer(load_config("basic"))
+    svg = renderer.render(family_data)
+
+    assert {"00101", "00102", "00103"} <= set(renderer.people)
+    # Everyone is still drawn (a placeholder partner may be added for the looped parent)
+    assert {"00101", "00102"} <= set(symbols(svg, "rect"))
+    assert "00103" in symbols(svg, "circle")
+
+def test_cache_key_changes_with_family_config_and_annotations(tmp_path):
+    cache = RenderCache(tmp_path)
+    config = load_config("basic")
+    key = cache.key(create_family(), config)
+
+    assert cache.key(create_family(), dict(config)) == key
+    assert cache.digest_key("d1", config) == key
+    assert cache.key(create_family(digest="d2"), config) != key
+    assert cache.key(create_family(), dict(config, size=config.get("size", 0) + 1)) != key
+    assert cache.key(create_family(), config, {"00101": {"x": 10}}) != key
+    assert (cache.key(create_family(), config, {"00101": {"x": 10}}) !=
+            cache.key(create_family(), config, {"00101": {"x": 20}}))
+
+def test_cache_renders_once(tmp_path, monkeypatch):
+    cache = RenderCache(tmp_path)
+    config = load_config("basic")
+    renders = []
+    render = PedigreeRenderer.render
+    monkeypatch.setattr(PedigreeRenderer, "render",
+                        lambda self, *args: renders.append(1) or render(self, *args))
+
+    first = cache.render(create_family(), config)
+    second = cache.render(create_family(), config)
+
+    assert first == second
+    assert len(renders) == 1
+    assert symbols(first, "rect") == ["00101", "00102"]
+    assert [p.suffix for p in tmp_path.iterdir()] == [".svg"]
+
+def test_cache_is_safe_across_threads(tmp_path):
+    cache = RenderCache(tmp_path)
+    config = load_config("basic")
+    results, errors = [], []
+
+    def render():
+        try:
+            results.append(cache.render(create_family(), config))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=render) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(results)) == 1
+    assert [p.suffix for p in tmp_path.iterdir()] == [".svg"]
+
+def test_render_folder_by_study(tmp_path):
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    ras_family = create_family(digest="d2")
+    ras_family["general"]["study"] = "RAS"
+    for family_id, family_data in (("F1", create_family()), ("F2", ras_family), ("F3", create_family(digest="d3"))):
+        with open(processed / f"{family_id}.processed.json", "w", encoding="utf-8") as f:
+            json.dump(family_data, f)
+    # F3 is not in the manifest, so its study is read from the processed file
+    with open(processed / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump({"families": {"F1": {"study": "LFS"}, "F2": {"study": "RAS"}}}, f)
+
+    written = render_folder(processed, tmp_path / "svg", load_config("basic"), study="LFS", workers=1)
+
+    assert [path.name for path in written] == ["F1.svg", "F3.svg"]
+    assert all(ET.parse(path).getroot().tag.endswith("svg") for path in written)
+    assert sorted(p.name for p in (tmp_path / "svg").glob("*.svg")) == ["F1.svg", "F3.svg"]
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the web routes
+
+These tests call the Flask app through its test client, reading families
+either from a temporary processed folder or from a temporary family store.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+pytest.importorskip("flask")
+
+import web
+from family_store import FamilyStore
+from test_family_store import create_family, write_family
+
+@pytest.fixture
+def file_client(tmp_path, monkeypatch):
+    """A client serving families from a processed folder."""
+    write_family(tmp_path, "F1", create_family())
+    monkeypatch.setattr(web, "PROCESSED_FOLDER", str(tmp_path))
+    monkeypatch.setattr(web, "ANNOTATIONS_FOLDER", str(tmp_path / "annotations"))
+    monkeypatch.setattr(web, "FAMILY_STORE", None)
+    return web.app.test_client()
+
+@pytest.fixture
+def store_client(tmp_path, monkeypatch):
+    """A client serving families from a family store that re-checks the folder on every request."""
+    write_family(tmp_path, "F1", create_family(), summary={"people": 3})
+    store = FamilyStore(tmp_path / "families.db")
+    store.load_folders(tmp_path)
+    monkeypatch.setattr(web, "PROCESSED_FOLDER", str(tmp_path))
+    monkeypatch.setattr(web, "ANNOTATIONS_FOLDER", str(tmp_path / "annotations"))
+    monkeypatch.setattr(web, "FAMILY_STORE", store)
+    monkeypatch.setattr(web, "FAMILY_DB_REFRESH", 0)
+    return web.app.test_client()
+
+def test_family_and_person_from_files(file_client):
+    assert file_client.get("/family/F1").get_json() == create_family()
+    assert file_client.get("/family/F1/person/00102").get_json()["name"] == "Robert Doe"
+    assert file_client.get("/family/F1/person/00199").status_code == 404
+    assert file_client.get("/family/F2/person/00101").status_code == 404
+
+def test_store_routes_need_the_store(file_client):
+    assert file_client.get("/families").status_code == 404
+    assert file_client.get("/people_with_code/C50.9").status_code == 404
+
+def test_family_and_person_from_store(store_client):
+    assert store_client.get("/family/F1").get_json() == create_family()
+    assert store_client.get("/family/F2").status_code == 404
+    assert store_client.get("/family/F1/person/00103").get_json()["name"] == "Jane Doe"
+    assert store_client.get("/family/F1/person/00199").status_code == 404
+
+def test_families_filters(store_client):
+    families = store_client.get("/families?study=LFS&code=C50.9").get_json()
+    assert [f["family_id"] for f in families] == ["F1"]
+    assert store_client.get("/families?study=RAS").get_json() == []
+    assert store_client.get("/people_with_code/85.41").get_json() == [
+        {"family_id": "F1", "person_id": "00102"}]
+
+def test_store_serves_families_processed_after_startup(store_client, tmp_path):
+    assert store_client.get("/family/F2").status_code == 404
+
+    # The processor writes a new family and re-processes an existing one
+    write_family(tmp_path, "F2", create_family(proband="00201"), summary={"people": 3})
+    reprocessed = create_family(digest="d2")
+    reprocessed["people"]["00104"] = {"father": "00102", "mother": "00103"}
+    write_family(tmp_path, "F1", reprocessed, summary={"people": 4})
+
+    assert store_client.get("/family/F2").get_json() == create_family(proband="00201")
+    assert store_client.get("/family/F1").get_json() == reprocessed
+    assert "00104" in store_client.get("/family/F1/nuclear/00101").get_json()["people"]
+    assert store_client.get("/manifest.json").get_json()["families"]["F1"]["people"] == 4
+    assert [f["family_id"] for f in store_client.get("/families").get_json()] == ["F1", "F2"]
+    assert store_client.get("/summary/F1").get_json() == {"people": 4}
+    assert store_client.get("/family_summaries").get_json() == {"F1": {"people": 4}, "F2": {"people": 3}}
+
+    (tmp_path / "F2.processed.json").unlink()
+    assert store_client.get("/family/F2").status_code == 404
+    assert store_client.get("/summary/F2").status_code == 404
+
+def test_render_cache_hit_skips_the_family_document(store_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(web, "RENDER_CACHE_FOLDER", str(tmp_path / "render_cache"))
+    first = store_client.get("/render/F1?config=basic")
+    assert first.status_code == 200
+    assert first.mimetype == "image/svg+xml"
+
+    monkeypatch.setattr(web, "load_family_data", lambda family_id: pytest.fail("family document loaded"))
+    assert store_client.get("/render/F1?config=basic").data == first.data
+    assert store_client.get("/render/F2?config=basic").status_code == 404
+
+def test_annotations_are_saved_to_the_store(store_client):
+    assert store_client.get("/annotations/F1").status_code == 404
+
+    annotations = {"00101": {"note": "x"}}
+    response = store_client.post("/write_annotations/F1", data=json.dumps(annotations))
+    assert response.status_code == 200
+    assert store_client.get("/annotations/F1").get_json() == annotations
+
+def test_neighborhood_and_nuclear_routes(file_client):
+    web.family_subgraph.cache_clear()
+
+    response = file_client.get("/family/F1/neighborhood/00101?depth=0").get_json()
+    assert list(response["people"]) == ["00101"]
+    assert response["truncated"] == {"00101": ["parents"]}
+    assert response["general"]["proband"] == "00101"
+
+    response = file_client.get("/family/F1/neighborhood/00101?depth=0&up=1").get_json()
+    assert list(response["people"]) == ["00101", "00102", "00103"]
+    assert response["truncated"] == {}
+
+    response = file_client.get("/family/F1/nuclear/00102").get_json()
+    assert response["focus"] == "00102"
+    assert list(response["people"]) == ["00101", "00102", "00103"]
+
+    assert file_client.get("/family/F1/nuclear/00199").status_code == 404
+    assert file_client.get("/family/F2/neighborhood/00101").status_code == 404
+
+def test_subgraphs_are_cached_until_the_family_changes(file_client, tmp_path):
+    web.family_subgraph.cache_clear()
+
+    file_client.get("/family/F1/nuclear/00101")
+    file_client.get("/family/F1/nuclear/00101")
+    assert web.family_subgraph.cache_info().hits == 1
+
+    # Re-processing the family changes its version, so the cached subgraph is not reused
+    family = create_family()
+    family["people"]["00104"] = {"father": "00102", "mother": "00103"}
+    write_family(tmp_path, "F1", family)
+
+    response = file_client.get("/family/F1/nuclear/00101").get_json()
+    assert "00104" in response["people"]
+    assert web.family_subgraph.cache_info().misses == 2
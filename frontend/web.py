@@ -1,6 +1,10 @@
-from flask import Flask, request, send_from_directory, render_template, redirect, url_for, jsonify
+from flask import Flask, request, send_from_directory, render_template, redirect, url_for, jsonify, abort, Response
 import os
 import json
+from functools import lru_cache
+from family_store import FamilyStore, FAMILY_FILTERS
+from pedigree_graph import PedigreeGraph
+from pedigree_svg import RenderCache
 
 app = Flask(__name__)
 app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True # Explicitly enable pretty-printing
@@ -9,6 +13,26 @@ app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True # Explicitly enable pretty-prin
 CONFIG_FOLDER = os.path.join(app.root_path, 'config')
 PROCESSED_FOLDER = os.path.join(app.root_path, '../../processed')
 ANNOTATIONS_FOLDER = os.path.join(app.root_path, 'annotations')
+RENDER_CACHE_FOLDER = os.path.join(app.root_path, 'render_cache')
+MANIFEST_NAME = "manifest.json"
+
+# Optional SQLite family store; when FHH_FAMILY_DB is set, families, summaries and
+# annotations are read from it instead of from files. It is loaded from the folders
+# above at startup and re-checked for new or changed files every
+# FHH_FAMILY_DB_REFRESH seconds (only changed files are parsed again)
+FAMILY_DB = os.environ.get('FHH_FAMILY_DB')
+FAMILY_DB_REFRESH = float(os.environ.get('FHH_FAMILY_DB_REFRESH', '5'))
+FAMILY_STORE = None
+if FAMILY_DB:
+    FAMILY_STORE = FamilyStore(FAMILY_DB)
+    if os.path.isdir(PROCESSED_FOLDER):
+        FAMILY_STORE.load_folders(PROCESSED_FOLDER, ANNOTATIONS_FOLDER)
+
+@app.before_request
+def refresh_family_store():
+    # Pick up families processed (or re-processed) since the store was last loaded
+    if FAMILY_STORE and os.path.isdir(PROCESSED_FOLDER):
+        FAMILY_STORE.refresh(PROCESSED_FOLDER, ANNOTATIONS_FOLDER, FAMILY_DB_REFRESH)
 
 @app.route('/')
 def index():
@@ -16,11 +40,184 @@ def index():
 
 @app.route('/family/<family_id>')
 def get_family(family_id):
+    if FAMILY_STORE:
+        data = FAMILY_STORE.get_family(family_id)
+        if data is None:
+            abort(404)
+        return jsonify(data)
+
     filename = family_id + ".processed.json"
     return send_from_directory(PROCESSED_FOLDER, filename)
 
+@app.route('/family/<family_id>/person/<person_id>')
+def get_person(family_id, person_id):
+    if FAMILY_STORE:
+        person = FAMILY_STORE.get_person(family_id, person_id)
+    else:
+        filename = os.path.join(PROCESSED_FOLDER, os.path.basename(family_id) + ".processed.json")
+        if not os.path.isfile(filename):
+            abort(404)
+        with open(filename, encoding='utf-8') as f:
+            person = json.load(f).get("people", {}).get(person_id)
+
+    if person is None:
+        abort(404)
+    return jsonify(person)
+
+def family_version(family_id):
+    # Changes whenever the family is re-processed, so cached graphs are never stale
+    if FAMILY_STORE:
+        digest = FAMILY_STORE.get_digest(family_id)
+        if digest is None:
+            abort(404)
+        return digest
+
+    filename = os.path.join(PROCESSED_FOLDER, os.path.basename(family_id) + ".processed.json")
+    if not os.path.isfile(filename):
+        abort(404)
+    return str(os.stat(filename).st_mtime_ns)
+
+def load_family_data(family_id):
+    if FAMILY_STORE:
+        data = FAMILY_STORE.get_family(family_id)
+    else:
+        filename = os.path.join(PROCESSED_FOLDER, os.path.basename(family_id) + ".processed.json")
+        data = None
+        if os.path.isfile(filename):
+            with open(filename, encoding='utf-8') as f:
+                data = json.load(f)
+    if data is None:
+        abort(404)
+    return data
+
+def load_annotations_data(family_id):
+    if FAMILY_STORE:
+        data = FAMILY_STORE.get_annotations(family_id)
+        return json.loads(data) if data else None
+
+    filename = os.path.join(ANNOTATIONS_FOLDER, os.path.basename(family_id) + ".annotations.json")
+    if not os.path.isfile(filename):
+        return None
+    with open(filename, encoding='utf-8') as f:
+        return json.load(f)
+
+@lru_cache(maxsize=32)
+def family_graph(family_id, version):
+    data = load_family_data(family_id)
+    return data.get("general", {}), PedigreeGraph(data.get("people", {}))
+
+@lru_cache(maxsize=1024)
+def family_subgraph(family_id, version, person_id, kind, up, down):
+    general, graph = family_graph(family_id, version)
+    if kind == "nuclear":
+        person_ids = graph.nuclear_families(person_id)
+    else:
+        person_ids = graph.neighborhood(person_id, up, down)
+    return {"general": general, **graph.subgraph(person_ids, focus=person_id)}
+
+@app.route('/family/<family_id>/neighborhood/<person_id>')
+def get_neighborhood(family_id, person_id):
+    # ?depth=N sets both directions; ?up=N / ?down=N override each one
+    depth = request.args.get('depth', 2, type=int)
+    up = max(0, request.args.get('up', depth, type=int))
+    down = max(0, request.args.get('down', depth, type=int))
+    try:
+        return jsonify(family_subgraph(family_id, family_version(family_id), person_id, "neighborhood", up, down))
+    except KeyError:
+        abort(404)
+
+@app.route('/family/<family_id>/nuclear/<person_id>')
+def get_nuclear_families(family_id, person_id):
+    try:
+        return jsonify(family_subgraph(family_id, family_version(family_id), person_id, "nuclear", 0, 0))
+    except KeyError:
+        abort(404)
+
+@app.route('/render/<family_id>')
+def render_family(family_id):
+    # Server-side SVG, cached by family digest plus config (and annotations) digest
+    config_name = os.path.basename(request.args.get('config', 'basic'))
+    config_filename = os.path.join(CONFIG_FOLDER, config_name + ".json")
+    if not os.path.isfile(config_filename):
+        abort(404)
+    with open(config_filename, encoding='utf-8') as f:
+        config = json.load(f)
+
+    cache = RenderCache(RENDER_CACHE_FOLDER)
+    annotations = load_annotations_data(family_id)
+    if FAMILY_STORE:
+        # The store knows the digest, so a cache hit never loads the family document
+        digest = FAMILY_STORE.get_digest(family_id)
+        if digest is None:
+            abort(404)
+        key = cache.digest_key(digest, config, annotations)
+        svg = cache.get(key)
+        if svg is None:
+            svg = cache.render(load_family_data(family_id), config, annotations, key=key)
+    else:
+        svg = cache.render(load_family_data(family_id), config, annotations)
+    return Response(svg, mimetype='image/svg+xml')
+
+@app.route('/families')
+def get_families():
+    # Indexed listing and filtering, e.g. /families?study=LFS&code=C50.9
+    if not FAMILY_STORE:
+        abort(404, description="Family store not configured (set FHH_FAMILY_DB)")
+
+    filters = {k: request.args.get(k) for k in FAMILY_FILTERS if request.args.get(k)}
+    return jsonify(FAMILY_STORE.list_families(code=request.args.get('code'), **filters))
+
+@app.route('/people_with_code/<code>')
+def get_people_with_code(code):
+    if not FAMILY_STORE:
+        abort(404, description="Family store not configured (set FHH_FAMILY_DB)")
+
+    return jsonify(FAMILY_STORE.find_people_by_code(code))
+
+@app.route('/summary/<family_id>')
+def get_summary(family_id):
+    if FAMILY_STORE:
+        data = FAMILY_STORE.get_summary(family_id)
+        if data is None:
+            abort(404)
+        return Response(data, mimetype='application/json')
+
+    filename = family_id + ".summary.json"
+    return send_from_directory(PROCESSED_FOLDER, filename)
+
+@app.route('/family_summaries')
+def get_family_summaries():
+    # Read only the small sidecars; ?families=a,b limits the batch to those families,
+    # otherwise every family in the manifest is returned
+    requested = request.args.get('families')
+    if requested:
+        family_ids = [f for f in requested.split(',') if f]
+    else:
+        family_ids = get_manifest_family_ids()
+
+    summaries = {}
+    for family_id in sorted(family_ids):
+        if FAMILY_STORE:
+            data = FAMILY_STORE.get_summary(family_id)
+            if data:
+                summaries[family_id] = json.loads(data)
+            continue
+
+        filename = os.path.join(PROCESSED_FOLDER, os.path.basename(family_id) + ".summary.json")
+        if os.path.isfile(filename):
+            with open(filename, encoding='utf-8') as f:
+                summaries[family_id] = json.load(f)
+
+    return jsonify(summaries)
+
 @app.route('/annotations/<family_id>')
 def get_annotations(family_id):
+    if FAMILY_STORE:
+        data = FAMILY_STORE.get_annotations(family_id)
+        if data is None:
+            abort(404)
+        return Response(data, mimetype='application/json')
+
     filename = family_id + ".annotations.json"
     app.logger.info(ANNOTATIONS_FOLDER + "/" + filename)
     return send_from_directory(ANNOTATIONS_FOLDER, filename)
@@ -38,6 +235,9 @@ def write_annotations(family_id):
     file_object = open(filename, "w")
     file_object.write(datastr)
 
+    if FAMILY_STORE:
+        FAMILY_STORE.save_annotations(family_id, datastr)
+
     return '{"response": "OK"}'
 
 
@@ -48,7 +248,37 @@ def get_config(config_name):
 
 @app.route('/list_of_families')
 def get_list_of_families():
-    return os.listdir(PROCESSED_FOLDER)
+    if FAMILY_STORE:
+        return [f["family_id"] + ".processed.json" for f in FAMILY_STORE.list_families()]
+
+    return [f for f in os.listdir(PROCESSED_FOLDER) if f.endswith(".processed.json")]
+
+def get_manifest_family_ids():
+    # Family IDs from the store, or from the manifest the processing pipeline maintains
+    if FAMILY_STORE:
+        return [f["family_id"] for f in FAMILY_STORE.list_families()]
+
+    manifest_path = os.path.join(PROCESSED_FOLDER, MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        return []
+    with open(manifest_path, encoding='utf-8') as f:
+        return list(json.load(f).get("families", {}))
+
+@app.route('/manifest.json')
+def get_manifest():
+    # The processing pipeline maintains the manifest; fall back to a bare listing
+    # for folders that were populated before it existed
+    if FAMILY_STORE:
+        families = {f["family_id"]: {"study": f["study"], "proband": f["proband"],
+                                     "people": f["people"], "last_updated": f["last_updated"]}
+                    for f in FAMILY_STORE.list_families()}
+        return jsonify({"families": families})
+
+    if os.path.isfile(os.path.join(PROCESSED_FOLDER, MANIFEST_NAME)):
+        return send_from_directory(PROCESSED_FOLDER, MANIFEST_NAME, max_age=60)
+
+    families = {f.split('.')[0]: {} for f in get_list_of_families()}
+    return jsonify({"families": families})
 
 
 if __name__ == '__main__':
@@ -65,5 +65,6 @@ const s3LambdaIntegrationStack = new S3LambdaIntegrationStack(
 );
 
 // Ensure proper stack dependencies
+cloudFrontS3Stack.addDependency(s3DataStack);
 s3LambdaIntegrationStack.addDependency(s3DataStack);
 s3LambdaIntegrationStack.addDependency(lambdaJsonProcessorStack);
@@ -1,5 +1,6 @@
 import * as cdk from 'aws-cdk-lib';
 import * as cloudfront from 'aws-cdk-lib/aws-cloudfront';
+import * as iam from 'aws-cdk-lib/aws-iam';
 import * as origins from 'aws-cdk-lib/aws-cloudfront-origins';
 import * as s3 from 'aws-cdk-lib/aws-s3';
 import * as s3deploy from 'aws-cdk-lib/aws-s3-deployment';
@@ -37,6 +38,11 @@ export class CloudFrontS3Stack extends cdk.Stack {
       destinationKeyPrefix: "",
     });
 
+    // The family manifest is written by the JSON processor to processed/manifest.json
+    // in the data bucket (see S3DataStack), so it is served from there rather than
+    // from a copy frozen into the website build
+    const dataBucket = s3.Bucket.fromBucketName(this, "DataBucket", `nci-cbiit-fhhpb-data-${tier}`);
+
     // Create CloudFront distribution
     this.distribution = new cloudfront.Distribution(this, 'FrontendDistribution', {
       defaultBehavior: {
@@ -45,6 +51,17 @@ export class CloudFrontS3Stack extends cdk.Stack {
         cachePolicy: cloudfront.CachePolicy.CACHING_OPTIMIZED,
         originRequestPolicy: cloudfront.OriginRequestPolicy.CORS_S3_ORIGIN,
       },
+      additionalBehaviors: {
+        'manifest.json': {
+          origin: origins.S3BucketOrigin.withOriginAccessControl(dataBucket, {
+            originPath: '/processed',
+          }),
+          viewerProtocolPolicy: cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+          // Honour the short max-age the processor sets on the manifest
+          cachePolicy: cloudfront.CachePolicy.USE_ORIGIN_CACHE_CONTROL_HEADERS,
+          originRequestPolicy: cloudfront.OriginRequestPolicy.CORS_S3_ORIGIN,
+        },
+      },
       defaultRootObject: 'index.html',
       errorResponses: [
         {
@@ -61,6 +78,24 @@ export class CloudFrontS3Stack extends cdk.Stack {
       priceClass: cloudfront.PriceClass.PRICE_CLASS_100, // Use only North America and Europe
     });
     
+    // Let this distribution, and no other, read the family manifest through origin
+    // access control. The data bucket is imported, so its policy is created here
+    const dataBucketPolicy = new s3.BucketPolicy(this, "DataBucketPolicy", {
+      bucket: dataBucket,
+    });
+    dataBucketPolicy.document.addStatements(
+      new iam.PolicyStatement({
+        principals: [new iam.ServicePrincipal("cloudfront.amazonaws.com")],
+        actions: ["s3:GetObject"],
+        resources: [dataBucket.arnForObjects("processed/manifest.json")],
+        conditions: {
+          StringEquals: {
+            "AWS:SourceArn": this.distribution.distributionArn,
+          },
+        },
+      })
+    );
+
     // Add tags to CloudFront distribution
     const cloudfrontTags = createTags({ tier, resourceName: 'cloudfront' });
     Object.entries(cloudfrontTags).forEach(([key, value]) => {
@@ -25,6 +25,10 @@ export class S3DataStack extends cdk.Stack {
       cdk.Tags.of(this.dataBucket).add(key, value);
     });
 
+    // The bucket policy (CloudFront read access to processed/manifest.json) is
+    // created by CloudFrontS3Stack, so it can name that stack's distribution;
+    // a bucket has a single policy, so do not add statements to it here
+
     // Output the bucket name
     new cdk.CfnOutput(this, "DataBucketName", {
       value: this.dataBucket.bucketName,
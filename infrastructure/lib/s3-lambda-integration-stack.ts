@@ -13,11 +13,14 @@ export class S3LambdaIntegrationStack extends cdk.Stack {
   constructor(scope: Construct, id: string, props: S3LambdaIntegrationStackProps) {
     super(scope, id, props);
 
-    // Add S3 event trigger for data bucket
-    props.dataBucket.addEventNotification(
-      s3.EventType.OBJECT_CREATED,
-      new s3n.LambdaDestination(props.lambdaFunction),
-      { prefix: "raw/", suffix: ".json" }
-    );
+    // Add S3 event triggers for data bucket, one per supported raw input format
+    const destination = new s3n.LambdaDestination(props.lambdaFunction);
+    for (const suffix of [".json", ".csv", ".tsv", ".json.gz", ".csv.gz", ".tsv.gz"]) {
+      props.dataBucket.addEventNotification(
+        s3.EventType.OBJECT_CREATED,
+        destination,
+        { prefix: "raw/", suffix }
+      );
+    }
   }
 }
@@ -1,5 +1,5 @@
 import * as cdk from 'aws-cdk-lib';
-import { Template } from 'aws-cdk-lib/assertions';
+import { Match, Template } from 'aws-cdk-lib/assertions';
 import { CloudFrontS3Stack } from '../lib/cloudfront-s3-stack';
 import { LambdaJsonProcessorStack } from '../lib/lambda-json-processor-stack';
 
@@ -36,6 +36,39 @@ describe('CloudFrontS3Stack', () => {
       },
     });
 
+    // Check that manifest.json is served from processed/ in the data bucket
+    template.hasResourceProperties('AWS::CloudFront::Distribution', {
+      DistributionConfig: {
+        CacheBehaviors: Match.arrayWith([
+          Match.objectLike({ PathPattern: 'manifest.json' }),
+        ]),
+        Origins: Match.arrayWith([
+          Match.objectLike({ OriginPath: '/processed' }),
+        ]),
+      },
+    });
+
+    // Check that only this distribution may read the manifest
+    template.hasResourceProperties('AWS::S3::BucketPolicy', {
+      Bucket: 'nci-cbiit-fhhpb-data-dev',
+      PolicyDocument: {
+        Statement: [
+          Match.objectLike({
+            Action: 's3:GetObject',
+            Principal: { Service: 'cloudfront.amazonaws.com' },
+            Resource: {
+              'Fn::Join': ['', Match.arrayWith([':s3:::nci-cbiit-fhhpb-data-dev/processed/manifest.json'])],
+            },
+            Condition: {
+              StringEquals: {
+                'AWS:SourceArn': Match.objectLike({ 'Fn::Join': Match.anyValue() }),
+              },
+            },
+          }),
+        ],
+      },
+    });
+
     // Check that outputs are created
     template.hasOutput('BucketName', {});
     template.hasOutput('WebsiteURL', {});